@@ -0,0 +1,130 @@
+"""工具描述文本。
+
+长描述单独成模块，由 tool_schema 导入并重新导出。
+"""
+
+from __future__ import annotations
+
+__all__ = ["TOOL_DESCRIPTIONS"]
+
+# 四个 CLI agent 描述共用的段落（导入时拼接一次）
+_NO_SHARED_MEMORY_TMPL = """NO SHARED MEMORY:
+- Cannot see messages/outputs from {others}.
+- Only receives: (1) this prompt, (2) a list of reference paths from context_paths (not file contents), (3) its own history via continuation_id.
+- Can read files from the workspace during execution (subject to permission).
+
+"""
+
+_CROSS_AGENT_HANDOFF = """CROSS-AGENT HANDOFF:
+- Small data: paste into prompt.
+- Step 1 (write): provide handoff_file so this tool appends its output as <agent-output ...>.
+- Step 2 (read): in a later call, pass that file via context_paths and explicitly instruct the agent what to read.
+- The handoff file contains multiple <agent-output ...> blocks; when it grows, read only the last N blocks or filter by task_note/task_index.
+
+"""
+
+# 工具描述
+TOOL_DESCRIPTIONS = {
+    "codex": (
+        "Run OpenAI Codex CLI agent (deep analysis / critical review).\n\n"
+        + _NO_SHARED_MEMORY_TMPL.format(others="gemini/claude/opencode")
+        + _CROSS_AGENT_HANDOFF
+        + """CAPABILITIES:
+- Strongest deep analysis and reflection abilities
+- Excellent at finding issues, edge cases, and potential bugs
+- Good at critical code review and architectural assessment
+
+BEST PRACTICES:
+- Be explicit about scope: "Only fix X, don't refactor Y"
+- Specify constraints: "Keep it simple, no new abstractions"
+
+Supports: image attachments."""
+    ),
+
+    "gemini": (
+        "Run Google Gemini CLI agent (UI design / comprehensive analysis).\n\n"
+        + _NO_SHARED_MEMORY_TMPL.format(others="codex/claude/opencode")
+        + _CROSS_AGENT_HANDOFF
+        + """CAPABILITIES:
+- Strongest UI design and image understanding abilities
+- Excellent at rapid UI prototyping and visual tasks
+- Great at inferring original requirements from code clues
+- Best for full-text analysis and detective work
+
+BEST PRACTICES:
+- Good first choice for "understand this codebase" tasks"""
+    ),
+
+    "claude": (
+        "Run Anthropic Claude CLI agent (code implementation).\n\n"
+        + _NO_SHARED_MEMORY_TMPL.format(others="codex/gemini/opencode")
+        + _CROSS_AGENT_HANDOFF
+        + """CAPABILITIES:
+- Strongest code writing and implementation abilities
+- Excellent at translating requirements into working code
+- Good at following patterns and conventions
+
+BEST PRACTICES:
+- Be explicit about target: "Replace old implementation completely"
+- Specify cleanup: "Remove deprecated code paths"
+
+Supports: system_prompt, append_system_prompt, agent parameter."""
+    ),
+
+    "opencode": (
+        "Run OpenCode CLI agent (full-stack development).\n\n"
+        + _NO_SHARED_MEMORY_TMPL.format(others="codex/gemini/claude")
+        + _CROSS_AGENT_HANDOFF
+        + """CAPABILITIES:
+- Excellent at rapid prototyping and development tasks
+- Good at working with multiple frameworks and tools
+- Supports multiple AI providers (Anthropic, OpenAI, Google, etc.)
+
+BEST PRACTICES:
+- Specify agent type for specialized tasks (e.g., --agent build)
+- Use file attachments for context-heavy tasks
+
+Supports: file attachments, multiple agents (build, plan, etc.)."""
+    ),
+
+    "banana": """Generate images using Nano Banana Pro (Gemini 3 Pro Image).
+
+CAPABILITIES:
+- Text-to-image generation with high quality output
+- Image editing and transformation with reference images
+- Multiple aspect ratios and resolutions (1K/2K/4K)
+- Style transfer and multi-image fusion
+- Optional search grounding for factual content
+
+RESPONSE FORMAT:
+- Returns XML with file paths to generated images
+- Images are saved to disk (no base64 in response)
+- Includes text descriptions and optional thinking process
+
+BEST PRACTICES:
+- Be descriptive: describe scenes, not just keywords
+- Use negative constraints in prompt: "no text", "no watermark"
+- For editing: provide reference image and specify what to keep
+- For style transfer: provide style reference image
+
+Supports: reference images with roles (edit_base, style_ref, etc.).""",
+
+    "image": """Generate images via OpenRouter-compatible or OpenAI-compatible endpoints.
+
+CAPABILITIES:
+- Text-to-image generation with multiple providers
+- Image editing and transformation with reference images
+- Multiple aspect ratios and resolutions (1K/2K/4K)
+
+RESPONSE FORMAT:
+- Returns XML with file paths to generated images
+- Images saved to disk (no base64 in response)
+- Includes text descriptions when available
+
+BEST PRACTICES:
+- Be descriptive: describe scenes, lighting, style, composition
+- Use negative constraints in prompt: "no text", "no watermark", "no blur"
+- For editing: provide reference image and specify what to keep
+
+Supports: reference images for editing.""",
+}
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import json
 import logging
 import sys
 import time
@@ -173,12 +174,41 @@ async def run_server() -> None:
 
         logger.info("run_server: cleanup completed")
 
+        # 清理已完成，后续的正常退出流程不再需要强制退出兜底
+        if signal_manager:
+            signal_manager.cancel_force_exit_backstop()
+
         # 检查是否需要强制退出（双击 SIGINT）
         if signal_manager and signal_manager.is_force_exit:
             logger.warning("Force exit requested, terminating with exit code 130")
             sys.exit(130)  # 128 + SIGINT(2) = 130
 
 
+class _JsonSerializingFormatter(logging.Formatter):
+    """LOG_DEBUG 模式的格式化器：尝试将日志参数中的对象 JSON 序列化。"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        # 尝试序列化 args 中的对象
+        if record.args:
+            new_args = []
+            for arg in record.args:
+                try:
+                    if hasattr(arg, "to_dict"):
+                        # 统一事件等 slots dataclass（无 __dict__）
+                        new_args.append(json.dumps(arg.to_dict(), ensure_ascii=False, default=str))
+                    elif hasattr(arg, "__dict__") and not isinstance(arg, (str, int, float, bool, type(None))):
+                        # 普通对象
+                        new_args.append(json.dumps(vars(arg), ensure_ascii=False, default=str))
+                    elif isinstance(arg, dict):
+                        new_args.append(json.dumps(arg, ensure_ascii=False, default=str))
+                    else:
+                        new_args.append(arg)
+                except Exception:
+                    new_args.append(arg)
+            record.args = tuple(new_args)
+        return super().format(record)
+
+
 def main() -> None:
     """主入口点。"""
     config = get_config()
@@ -190,31 +220,7 @@ def main() -> None:
         # LOG_DEBUG 模式：输出到临时文件
         file_handler = logging.FileHandler(config.log_file, encoding="utf-8")
 
-        # 自定义格式化器：尝试将对象 JSON 序列化
-        class JsonSerializingFormatter(logging.Formatter):
-            def format(self, record: logging.LogRecord) -> str:
-                # 尝试序列化 args 中的对象
-                if record.args:
-                    import json
-                    new_args = []
-                    for arg in record.args:
-                        try:
-                            if hasattr(arg, "model_dump"):
-                                # Pydantic 模型
-                                new_args.append(json.dumps(arg.model_dump(), ensure_ascii=False))
-                            elif hasattr(arg, "__dict__") and not isinstance(arg, (str, int, float, bool, type(None))):
-                                # 普通对象
-                                new_args.append(json.dumps(vars(arg), ensure_ascii=False, default=str))
-                            elif isinstance(arg, dict):
-                                new_args.append(json.dumps(arg, ensure_ascii=False, default=str))
-                            else:
-                                new_args.append(arg)
-                        except Exception:
-                            new_args.append(arg)
-                    record.args = tuple(new_args)
-                return super().format(record)
-
-        file_handler.setFormatter(JsonSerializingFormatter(
+        file_handler.setFormatter(_JsonSerializingFormatter(
             "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
         ))
         log_handlers.append(file_handler)
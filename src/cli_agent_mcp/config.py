@@ -38,6 +38,10 @@
     CAM_SIGINT_DOUBLE_TAP_WINDOW: 双击退出窗口时间（秒）
         - 默认 1.0 秒
         - 在此时间窗口内第二次 Ctrl+C 将强制退出
+
+    CAM_SIGINT_FORCE_EXIT_TIMEOUT: 强制退出兜底时间（秒）
+        - 默认 5.0 秒
+        - 双击 Ctrl+C 后清理超过该时间仍未退出，直接以 130 结束进程
 """
 
 from __future__ import annotations
@@ -148,6 +152,7 @@ class Config:
         log_file: 日志文件路径（当 log_debug=True 时自动设置）
         sigint_mode: SIGINT 处理模式
         sigint_double_tap_window: 双击退出窗口时间（秒）
+        sigint_force_exit_timeout: 强制退出兜底时间（秒）
     """
 
     tools: set[str] = field(default_factory=set)
@@ -159,6 +164,7 @@ class Config:
     log_file: str | None = None
     sigint_mode: SigintMode = SigintMode.CANCEL
     sigint_double_tap_window: float = 1.0
+    sigint_force_exit_timeout: float = 5.0
 
     @property
     def allowed_tools(self) -> set[str]:
@@ -180,7 +186,8 @@ class Config:
             f"log_debug={self.log_debug}, "
             f"log_file={self.log_file}, "
             f"sigint_mode={self.sigint_mode.value}, "
-            f"sigint_double_tap_window={self.sigint_double_tap_window})"
+            f"sigint_double_tap_window={self.sigint_double_tap_window}, "
+            f"sigint_force_exit_timeout={self.sigint_force_exit_timeout})"
         )
 
 
@@ -219,6 +226,17 @@ def _parse_double_tap_window(value: str | None) -> float:
         return 1.0
 
 
+def _parse_force_exit_timeout(value: str | None) -> float:
+    """解析强制退出兜底时间环境变量。"""
+    if not value:
+        return 5.0
+    try:
+        timeout = float(value)
+        return max(1.0, min(timeout, 60.0))  # 限制在 1-60 秒范围
+    except ValueError:
+        return 5.0
+
+
 def load_config() -> Config:
     """从环境变量加载配置。"""
     log_debug = _parse_bool(os.environ.get("CAM_LOG_DEBUG"), default=False)
@@ -239,6 +257,9 @@ def load_config() -> Config:
         sigint_double_tap_window=_parse_double_tap_window(
             os.environ.get("CAM_SIGINT_DOUBLE_TAP_WINDOW")
         ),
+        sigint_force_exit_timeout=_parse_force_exit_timeout(
+            os.environ.get("CAM_SIGINT_FORCE_EXIT_TIMEOUT")
+        ),
     )
 
 
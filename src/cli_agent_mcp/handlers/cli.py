@@ -160,8 +160,8 @@ class CLIHandler(ToolHandler):
 
     @property
     def description(self) -> str:
-        from ..tool_schema import TOOL_DESCRIPTIONS
-        return TOOL_DESCRIPTIONS.get(self._cli_type, "")
+        from ..tool_schema import get_tool_description
+        return get_tool_description(self._cli_type)
 
     def get_input_schema(self) -> dict[str, Any]:
         from ..tool_schema import create_tool_schema
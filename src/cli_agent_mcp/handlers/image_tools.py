@@ -82,7 +82,7 @@ Supports: reference images with roles (edit_base, style_ref, etc.)."""
         # 创建事件回调
         def event_callback(event: Any) -> None:
             if ctx.gui_manager and ctx.gui_manager.is_running:
-                event_dict = event.model_dump() if hasattr(event, "model_dump") else dict(event.__dict__)
+                event_dict = event.to_dict()
                 event_dict["source"] = "banana"
                 ctx.gui_manager.push_event(event_dict)
 
@@ -218,7 +218,7 @@ Supports: reference images for editing."""
         # 创建事件回调
         def event_callback(event: Any) -> None:
             if ctx.gui_manager and ctx.gui_manager.is_running:
-                event_dict = event.model_dump() if hasattr(event, "model_dump") else dict(event.__dict__)
+                event_dict = event.to_dict()
                 event_dict["source"] = "image"
                 ctx.gui_manager.push_event(event_dict)
 
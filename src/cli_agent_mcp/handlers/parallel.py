@@ -461,6 +461,7 @@ class ParallelHandler(ToolHandler):
             debug_info=debug_info,
             success=not has_failures,
             error=f"{failed_count} of {len(results)} tasks failed" if has_failures else None,
+            answer_is_xml=True,
         )
         formatted_response = formatter.format(response_data, debug=debug_enabled)
 
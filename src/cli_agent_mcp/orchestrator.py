@@ -180,8 +180,12 @@ class RequestRegistry:
         """取消所有活动请求。
 
         Returns:
-            成功发起取消的请求数量
+            成功发起取消的请求数量（注册表为空时直接返回 0，
+            调用方无需再先调用 has_active_requests()）
         """
+        if not self._requests:
+            return 0
+
         cancelled = 0
         for info in list(self._requests.values()):
             if not info.task.done():
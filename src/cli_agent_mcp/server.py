@@ -9,6 +9,7 @@
     CAM_GUI_DETAIL: GUI 详细模式 (默认 false)
     CAM_SIGINT_MODE: SIGINT 处理模式 (cancel/exit/cancel_then_exit)
     CAM_SIGINT_DOUBLE_TAP_WINDOW: 双击退出窗口时间 (默认 1.0s)
+    CAM_SIGINT_FORCE_EXIT_TIMEOUT: 强制退出兜底时间 (默认 5.0s)
 
 用法:
     uvx cli-agent-mcp
@@ -137,9 +138,10 @@ def create_server(
     def make_event_callback(cli_type: str, task_note: str = "", task_index: Optional[int] = None):
         def callback(event):
             if gui_manager and gui_manager.is_running:
-                event_dict = event.model_dump() if hasattr(event, "model_dump") else dict(event.__dict__)
+                event_dict = event.to_dict()
                 event_dict["source"] = cli_type
-                metadata = event_dict.get("metadata", {}) or {}
+                # to_dict() 为浅拷贝，复制 metadata 以免改动事件本身
+                metadata = dict(event_dict.get("metadata") or {})
                 if task_note:
                     metadata["task_note"] = task_note
                 if task_index is not None:
@@ -60,7 +60,7 @@ class EventRenderer:
         """渲染单个事件为 HTML。
 
         Args:
-            event: 统一事件字典（UnifiedEvent.model_dump()）
+            event: 统一事件字典（UnifiedEvent.to_dict()）
 
         Returns:
             HTML 字符串
@@ -411,7 +411,7 @@ class LiveViewer:
         """推送统一事件到显示队列。
 
         Args:
-            event: 统一事件字典（UnifiedEvent.model_dump()）
+            event: 统一事件字典（UnifiedEvent.to_dict()）
 
         Returns:
             是否成功入队（队列满时返回 False）
@@ -23,6 +23,7 @@ import logging
 import os
 import re
 import shutil
+import signal
 import subprocess
 import sys
 import time
@@ -31,6 +32,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 
+from ..parsers import CLISource, ContentType, EventCategory, make_fallback_event
 from .types import (
     CLIType,
     CommonParams,
@@ -39,9 +41,36 @@ from .types import (
     GUIMetadata,
 )
 
+# 可选：orjson 直接解析 bytes，速度明显快于标准库 json
+try:
+    import orjson
+
+    _json_loads: Callable[[bytes | str], Any] = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _loads_stdout_line(raw_line: bytes) -> Any:
+    """解析一行 stdout JSON。
+
+    先直接解析 bytes；含非法 UTF-8 / 孤立代理项时 orjson（及 json 解析 bytes）
+    会报错，此时按 errors="replace" 解码后再用标准库重试，避免丢失真实事件。
+
+    Raises:
+        ValueError: 两次解析都失败（非 JSON 行）
+    """
+    try:
+        return _json_loads(raw_line)
+    except ValueError:
+        return json.loads(raw_line.decode("utf-8", errors="replace"))
+
+
 if TYPE_CHECKING:
     from ..parsers import UnifiedEvent
 
+# 计入 tool_call_count 的操作类型（str 枚举与字符串哈希一致，可直接 in 判断）
+_TOOL_CALL_OPERATION_TYPES = frozenset({"tool_call", "function_call", "command"})
+
 __all__ = [
     "CLIInvoker",
     "EventCallback",
@@ -50,6 +79,37 @@ __all__ = [
 ]
 
 
+def _extract_json_error(error_msg: str) -> str:
+    """从错误消息内嵌的 JSON 对象中提取 "[code] message"。
+
+    用字面量预判 + find/rfind 定位 JSON 片段，避免 `.*` 正则的回溯开销。
+
+    Args:
+        error_msg: 原始错误消息
+
+    Returns:
+        提取到 code 和 message 时返回格式化后的消息，否则原样返回
+    """
+    if '"error"' not in error_msg:
+        return error_msg
+    start = error_msg.find("{")
+    end = error_msg.rfind("}")
+    if start < 0 or end <= start:
+        return error_msg
+    try:
+        error_json = json.loads(error_msg[start:end + 1])
+    except json.JSONDecodeError:
+        return error_msg
+    if isinstance(error_json, dict) and "error" in error_json:
+        err = error_json["error"]
+        if isinstance(err, dict):
+            code = err.get("code", "")
+            msg = err.get("message", "")
+            if code and msg:
+                return f"[{code}] {msg}"
+    return error_msg
+
+
 class FirstEventTimeoutError(Exception):
     """首次事件超时异常。
 
@@ -70,7 +130,7 @@ EventCallback = Callable[["UnifiedEvent"], None]
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionContext:
     """执行上下文 - 持有 per-request 的执行态。
 
@@ -80,9 +140,10 @@ class ExecutionContext:
     Attributes:
         process: 当前子进程引用
         session_id: 从事件流中提取的会话 ID
-        collected_messages: 收集的原始消息
+        collected_messages: 收集的原始消息（仅 collect_all_messages=True 时收集）
         agent_messages: 过程中的 assistant 消息（不含 reasoning）
-        final_answer: 最终答案（最后一条 agent_message）
+        final_answer_parts: 最终答案（最后一条 agent_message）的分片，
+            通过 final_answer 属性拼接读取
         exit_error: 非零退出码的错误信息
         captured_errors: 捕获的非 JSON 错误信息
         debug_info: 调试统计信息
@@ -96,7 +157,8 @@ class ExecutionContext:
     # 消息收集
     collected_messages: list[dict[str, Any]] = field(default_factory=list)
     agent_messages: list[str] = field(default_factory=list)
-    final_answer: str = ""
+    # delta 消息追加到列表，读取时再 join，避免逐段字符串拼接的 O(n²) 开销
+    final_answer_parts: list[str] = field(default_factory=list)
 
     # 错误状态
     exit_error: str | None = None
@@ -105,6 +167,20 @@ class ExecutionContext:
     # 调试信息
     debug_info: DebugInfo = field(default_factory=DebugInfo)
 
+    @property
+    def final_answer(self) -> str:
+        """最终答案（拼接分片，并合并为单个分片以免重复 join）。"""
+        parts = self.final_answer_parts
+        if not parts:
+            return ""
+        if len(parts) > 1:
+            parts[:] = ["".join(parts)]
+        return parts[0]
+
+    @final_answer.setter
+    def final_answer(self, value: str) -> None:
+        self.final_answer_parts = [value] if value else []
+
 
 class CLIInvoker(ABC):
     """CLI 调用器抽象基类。
@@ -128,25 +204,31 @@ class CLIInvoker(ABC):
     - event_callback 和 parser 是配置，可以保留在 invoker 上
     """
 
-    # 非 JSON 行中的错误模式（用于提取有用信息）
-    _ERROR_PATTERNS = [
+    # 非 JSON 行中的错误模式（用于提取有用信息，类定义时预编译）
+    # 第三项为该模式必须包含的字面量：行中不含该字面量时直接跳过正则
+    _ERROR_PATTERNS: list[tuple[re.Pattern[str], str, str]] = [
         # Gemini API 重试错误
-        (r"Attempt \d+ failed with status (\d+)\. .* ApiError: (.+)", "api_error"),
+        (re.compile(r"Attempt \d+ failed with status (\d+)\. .* ApiError: (.+)"), "api_error", "Attempt "),
         # 工具执行错误
-        (r"Error executing tool (\w+): (.+)", "tool_error"),
+        (re.compile(r"Error executing tool (\w+): (.+)"), "tool_error", "Error executing tool "),
         # 通用错误堆栈起始
-        (r"ApiError: (.+)", "api_error"),
+        (re.compile(r"ApiError: (.+)"), "api_error", "ApiError: "),
         # OpenCode/Bun 错误 (TypeScript runtime errors)
-        (r"(\w+Error): (.+)", "runtime_error"),
+        (re.compile(r"(\w+Error): (.+)"), "runtime_error", "Error: "),
+    ]
+
+    # 锚定行首的错误行形态，合并为一个带命名分组的交替正则，一次 match 完成分类
+    # 分组名即错误类型（m.lastgroup），按先后顺序优先匹配
+    _ERROR_LINE_SHAPE_RE: re.Pattern[str] = re.compile(
         # Node.js/Bun 抛出的错误
-        (r"^\s*throw\s+", "throw_error"),
+        r"(?P<throw_error>\s*throw\s+)"
         # 堆栈跟踪起始
-        (r"^\s+at\s+.+\(.+:\d+:\d+\)", "stack_trace"),
+        r"|(?P<stack_trace>\s+at\s+.+\(.+:\d+:\d+\))"
         # OpenCode 特有：数字 | 开头的源码行
-        (r"^\d+\s*\|", "source_line"),
+        r"|(?P<source_line>\d+\s*\|)"
         # OpenCode 特有：^ 指示错误位置
-        (r"^\s+\^", "error_pointer"),
-    ]
+        r"|(?P<error_pointer>\s+\^)"
+    )
 
     # 致命错误模式 - 匹配到这些模式时立即终止进程
     # 这些错误表明 CLI 进入了无法恢复的状态（如无限重试循环）
@@ -183,20 +265,35 @@ class CLIInvoker(ABC):
         self,
         event_callback: EventCallback | None = None,
         parser: Any | None = None,
+        collect_all_messages: bool = False,
     ) -> None:
         """初始化调用器。
 
         Args:
             event_callback: 事件回调函数，用于 GUI 推送
             parser: 自定义解析器实例（可选）
+            collect_all_messages: 是否收集全部原始事件到 ExecutionResult.all_messages
+                （默认关闭，长会话下避免保留大量原始事件）
         """
         # 配置（可复用）
         self._event_callback = event_callback
         self._parser = parser
+        self._collect_all_messages = collect_all_messages
 
         # 当前执行上下文（per-request，每次 execute 创建新的）
         self._ctx: ExecutionContext | None = None
 
+        # 事件来源（cli_type 在 invoker 生命周期内不变，只解析一次）
+        try:
+            self._cli_source = CLISource(self.cli_name)
+        except ValueError:
+            self._cli_source = CLISource.UNKNOWN
+        # 合成 system 事件的公共字段模板
+        self._event_base: dict[str, str] = {"type": "system", "source": self.cli_name}
+
+        # 进行中的子进程终止任务（并发的 cancel() 共享同一个任务）
+        self._terminator_task: asyncio.Future[None] | None = None
+
     # =========================================================================
     # 兼容性属性（向后兼容，访问当前上下文的字段）
     # =========================================================================
@@ -241,6 +338,11 @@ class CLIInvoker(ABC):
         if self._ctx:
             self._ctx.final_answer = value
 
+    @property
+    def _final_answer_parts(self) -> list[str]:
+        """兼容性属性：final_answer_parts。"""
+        return self._ctx.final_answer_parts if self._ctx else []
+
     @property
     def _exit_error(self) -> str | None:
         """兼容性属性：exit_error。"""
@@ -317,6 +419,18 @@ class CLIInvoker(ABC):
         if not workspace.is_dir():
             raise ValueError(f"workspace is not a directory: {workspace}")
 
+    async def _validate_files(self, params: CommonParams) -> None:
+        """验证参数引用的附件文件（在线程中执行文件系统检查）。
+
+        默认无附件需要检查，子类按需覆盖。
+
+        Args:
+            params: 调用参数
+
+        Raises:
+            ValueError: 文件不存在时抛出
+        """
+
     def _get_parser(self) -> Any:
         """获取解析器实例。
 
@@ -353,6 +467,7 @@ class CLIInvoker(ABC):
 
         try:
             self.validate_params(params)
+            await self._validate_files(params)
         except ValueError as e:
             return ExecutionResult(
                 success=False,
@@ -396,17 +511,24 @@ class CLIInvoker(ABC):
                     self._process_event(event, params)
 
                 end_time = time.time()
-                self._ctx.debug_info.duration_sec = end_time - start_time
+                ctx = self._ctx
+                ctx.debug_info.duration_sec = end_time - start_time
 
                 # 检查是否有退出错误（非零退出码）
-                success = self._ctx.exit_error is None
+                success = ctx.exit_error is None
+
+                # 中间消息数量少，转为紧凑的只读 tuple；原始事件列表直接移交给结果
+                # （上下文随后在 finally 中释放）
+                thought_steps = tuple(map(str.strip, ctx.agent_messages))
+                all_messages = ctx.collected_messages if self._collect_all_messages else None
 
                 result = ExecutionResult(
                     success=success,
-                    session_id=self._ctx.session_id,
-                    agent_messages=self._ctx.final_answer.strip(),  # 最终答案（最后一条）
-                    thought_steps=[s.strip() for s in self._ctx.agent_messages],  # 中间消息（除最后一条外）
-                    error=self._ctx.exit_error,  # 退出错误信息
+                    session_id=ctx.session_id,
+                    agent_messages=ctx.final_answer.strip(),  # 最终答案（最后一条）
+                    thought_steps=thought_steps,  # 中间消息（除最后一条外）
+                    error=ctx.exit_error,  # 退出错误信息
+                    all_messages=all_messages,
                     gui_metadata=GUIMetadata(
                         task_note=params.task_note,
                         task_tags=params.task_tags,
@@ -414,7 +536,7 @@ class CLIInvoker(ABC):
                         start_time=start_time,
                         end_time=end_time,
                     ),
-                    debug_info=self._ctx.debug_info,
+                    debug_info=ctx.debug_info,
                 )
                 return result
 
@@ -555,6 +677,7 @@ class CLIInvoker(ABC):
         self._ctx = ExecutionContext()
 
         self.validate_params(params)
+        await self._validate_files(params)
         cmd = self.build_command(params)
         logger.info(f"Streaming: {' '.join(cmd)}")
 
@@ -648,8 +771,8 @@ class CLIInvoker(ABC):
         stderr_chunks: list[bytes] = []
         stderr_total_size = 0
 
-        # DEBUG: 收集 stdout 原始输出用于调试
-        stdout_lines_raw: list[str] = []
+        # DEBUG: 收集 stdout 原始输出用于调试（保留 bytes，仅在需要输出日志时才解码）
+        stdout_lines_raw: list[bytes] = []
 
         # 致命错误检测状态
         fatal_error_event = asyncio.Event()
@@ -677,7 +800,7 @@ class CLIInvoker(ABC):
                 chunk = await self._process.stderr.read(4096)
                 if not chunk:
                     # 处理最后剩余的数据
-                    if line_buffer:
+                    if line_buffer.strip():
                         line = line_buffer.decode("utf-8", errors="replace")
                         self._check_stderr_line_for_fatal_error(
                             line, fatal_patterns, stderr_error_counts,
@@ -698,6 +821,9 @@ class CLIInvoker(ABC):
                 line_buffer += chunk
                 while b"\n" in line_buffer:
                     line_bytes, line_buffer = line_buffer.split(b"\n", 1)
+                    # 空行在解码前过滤
+                    if not line_bytes.strip():
+                        continue
                     line = line_bytes.decode("utf-8", errors="replace")
 
                     # 检测致命错误
@@ -823,22 +949,21 @@ class CLIInvoker(ABC):
                         if not line:
                             break
 
-                        try:
-                            decoded = line.decode("utf-8", errors="replace").strip()
-                        except Exception:
-                            continue
+                        raw_line = line.strip()
 
                         # DEBUG: 记录原始 stdout 行
-                        stdout_lines_raw.append(decoded)
+                        stdout_lines_raw.append(raw_line)
 
-                        if not decoded:
+                        # 在 bytes 层面快速过滤空行和启动日志，避免无谓的解码
+                        if not raw_line or raw_line.startswith(b"[STARTUP]"):
                             continue
 
-                        # 尝试解析 JSON
+                        # 尝试直接从 bytes 解析 JSON（无需先解码）
                         try:
-                            data = json.loads(decoded)
-                        except json.JSONDecodeError:
-                            # 非 JSON 行：尝试提取错误信息
+                            data = _loads_stdout_line(raw_line)
+                        except ValueError:
+                            # 非 JSON 行：解码后尝试提取错误信息
+                            decoded = raw_line.decode("utf-8", errors="replace")
                             error_info = self._extract_error_from_line(decoded)
                             if error_info:
                                 error_type, error_msg = error_info
@@ -865,18 +990,21 @@ class CLIInvoker(ABC):
                                 "[PARSE ERROR] %s failed to parse stdout line: %s\nRaw line: %s",
                                 self.cli_name,
                                 e,
-                                decoded,
+                                raw_line.decode("utf-8", errors="replace"),
                             )
                             continue
                         for event in events:
+                            # str 枚举可直接与成员比较，无需逐次取 .value
+                            category = event.category
+
                             # 标记已收到首次有效事件（忽略 lifecycle 事件如 turn_start）
-                            if not first_event_received and event.category.value != "lifecycle":
+                            if not first_event_received and category != EventCategory.LIFECYCLE:
                                 first_event_received = True
                                 logger.debug(f"[FIRST EVENT] Received first valid event from {self.cli_name}")
 
                             # 检测 stdout 中的 error 事件（如 item.type=error）
                             if (
-                                event.category.value == "system"
+                                category == EventCategory.SYSTEM
                                 and getattr(event, "severity", "") == "error"
                                 and not fatal_error_event.is_set()
                             ):
@@ -896,7 +1024,7 @@ class CLIInvoker(ABC):
 
                             # 消息累积逻辑：合并连续的 delta 消息
                             is_delta_message = (
-                                event.category.value == "message"
+                                category == EventCategory.MESSAGE
                                 and getattr(event, "is_delta", False)
                             )
 
@@ -960,8 +1088,8 @@ class CLIInvoker(ABC):
                 error_msg = f"{self.cli_name} exited with code {self._process.returncode}"
                 if stderr_content:
                     # 取最后 5 行，更容易捕获 API 错误
-                    lines = stderr_content.strip().split("\n")
-                    last_lines = "\n".join(lines[-5:]) if len(lines) > 5 else stderr_content.strip()
+                    # rsplit 只从尾部切分，不会为整个 stderr 构建行列表
+                    last_lines = "\n".join(stderr_content.strip().rsplit("\n", 5)[-5:])
                     error_msg += f":\n{last_lines}"
                 elif self._captured_errors:
                     # stderr 为空但 stdout 中捕获了错误（opencode 等会输出错误到 stdout）
@@ -991,7 +1119,7 @@ class CLIInvoker(ABC):
                     or (isinstance(exit_code, int) and exit_code != 0)
                 )
                 if had_error and stdout_lines_raw:
-                    stdout_content = "\n".join(stdout_lines_raw)
+                    stdout_content = b"\n".join(stdout_lines_raw).decode("utf-8", errors="replace")
                     if stdout_content.strip():
                         logger.warning("[SUBPROCESS] Stdout (on error):\n%s", stdout_content)
             except Exception as e:
@@ -1001,7 +1129,10 @@ class CLIInvoker(ABC):
             if logger.isEnabledFor(logging.DEBUG):
                 try:
                     stderr_content = b"".join(stderr_chunks).decode("utf-8", errors="replace")
-                    stdout_content = "\n".join(stdout_lines_raw) if stdout_lines_raw else ""
+                    stdout_content = (
+                        b"\n".join(stdout_lines_raw).decode("utf-8", errors="replace")
+                        if stdout_lines_raw else ""
+                    )
                     process_pid = self._process.pid if self._process else "N/A"
                     return_code = self._process.returncode if self._process else "N/A"
                     logger.debug(
@@ -1048,8 +1179,8 @@ class CLIInvoker(ABC):
         - Windows: 使用 CTRL_BREAK_EVENT 或回退到 terminate/kill
 
         Cancel-safe 实现：
-        - 整个终止流程被 asyncio.shield() 保护
-        - 即使被取消也会完成 SIGTERM -> SIGKILL 升级
+        - 终止流程作为单个后台任务运行（self._terminator_task），并发调用共享该任务
+        - 外部取消时循环 shield 等待任务完成，完成 SIGTERM -> SIGKILL 升级后再传播取消
         - finally 块确保 process.wait() 被调用以收割僵尸进程
         """
         if self._process is None:
@@ -1058,6 +1189,14 @@ class CLIInvoker(ABC):
         pid = self._process.pid
         process = self._process  # 保存引用，防止 self._process 被清理
 
+        # 进程组 ID 只查询一次，SIGTERM / SIGKILL 两个阶段共用
+        pgid: int | None = None
+        if sys.platform != "win32":
+            try:
+                pgid = os.getpgid(pid)
+            except (ProcessLookupError, OSError) as e:
+                logger.debug(f"getpgid failed for pid={pid}: {e}")
+
         async def _do_terminate() -> None:
             """实际的终止逻辑，被 shield 保护。"""
             try:
@@ -1065,21 +1204,13 @@ class CLIInvoker(ABC):
                 if sys.platform == "win32":
                     # Windows: 尝试 CTRL_BREAK_EVENT
                     try:
-                        import signal
                         os.kill(pid, signal.CTRL_BREAK_EVENT)
                         logger.debug(f"Sent CTRL_BREAK_EVENT to pid={pid}")
                     except (ProcessLookupError, OSError):
                         process.terminate()
                 else:
                     # POSIX: 发送 SIGTERM 到进程组
-                    try:
-                        import signal
-                        pgid = os.getpgid(pid)
-                        os.killpg(pgid, signal.SIGTERM)
-                        logger.debug(f"Sent SIGTERM to process group pgid={pgid}")
-                    except (ProcessLookupError, OSError) as e:
-                        logger.debug(f"killpg failed, falling back to terminate: {e}")
-                        process.terminate()
+                    self._killpg_or_fallback(pgid, signal.SIGTERM, process.terminate)
 
                 # 等待最多 2 秒
                 try:
@@ -1094,13 +1225,7 @@ class CLIInvoker(ABC):
                         process.kill()
                     else:
                         # POSIX: 发送 SIGKILL 到进程组
-                        try:
-                            import signal
-                            pgid = os.getpgid(pid)
-                            os.killpg(pgid, signal.SIGKILL)
-                            logger.debug(f"Sent SIGKILL to process group pgid={pgid}")
-                        except (ProcessLookupError, OSError):
-                            process.kill()
+                        self._killpg_or_fallback(pgid, signal.SIGKILL, process.kill)
 
                     # 再等待最多 1 秒
                     try:
@@ -1123,20 +1248,49 @@ class CLIInvoker(ABC):
                     except Exception:
                         pass
 
-        # 使用 shield 保护整个终止流程
-        # 即使外部取消，内部任务也会继续执行完成
-        task = asyncio.create_task(_do_terminate())
-        try:
-            await asyncio.shield(task)
-        except asyncio.CancelledError:
-            # 外部取消，但我们需要等待清理完成后再传播取消
+        # 终止任务挂在 invoker 上，并发的 cancel() 复用同一个任务
+        task = self._terminator_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(_do_terminate())
+            # 取回异常，避免 "Task exception was never retrieved" 警告
+            task.add_done_callback(
+                lambda t: t.cancelled() or t.exception()
+            )
+            self._terminator_task = task
+
+        # 单层 shield 循环：外部取消只记录下来，直到终止流程完成后再传播
+        cancelled = False
+        while not task.done():
             try:
                 await asyncio.shield(task)
             except asyncio.CancelledError:
-                # 二次取消，任务仍在后台执行
-                logger.debug(f"Double cancel during subprocess termination pid={pid}")
+                cancelled = True
+                logger.debug(f"Cancel received during subprocess termination pid={pid}")
+        if cancelled:
             logger.debug(f"_terminate_subprocess cancelled but cleanup completed for pid={pid}")
-            raise
+            raise asyncio.CancelledError()
+
+    @staticmethod
+    def _killpg_or_fallback(
+        pgid: int | None,
+        sig: signal.Signals,
+        fallback: Callable[[], None],
+    ) -> None:
+        """向进程组发送信号，失败（或无进程组）时回退到单进程操作。
+
+        Args:
+            pgid: 进程组 ID（None 表示未能获取）
+            sig: 要发送的信号
+            fallback: 回退操作（process.terminate / process.kill）
+        """
+        if pgid is not None:
+            try:
+                os.killpg(pgid, sig)
+                logger.debug(f"Sent {sig.name} to process group pgid={pgid}")
+                return
+            except (ProcessLookupError, OSError) as e:
+                logger.debug(f"killpg failed, falling back to single process: {e}")
+        fallback()
 
     def _parse_raw_data(self, parser: Any, data: dict[str, Any]) -> list["UnifiedEvent"]:
         """解析原始数据为统一事件。
@@ -1162,62 +1316,72 @@ class CLIInvoker(ABC):
             event: 统一事件
             params: 调用参数
         """
-        self._collected_messages.append(event.raw)
-        self._debug_info.message_count += 1
+        raw = event.raw
+        debug_info = self._debug_info
+        category = event.category
+
+        if self._collect_all_messages:
+            self._collected_messages.append(raw)
+        debug_info.message_count += 1
 
         # 提取 session_id
-        if not self._session_id and hasattr(event, "session_id"):
-            if event.session_id:
-                self._session_id = event.session_id
+        if not self._session_id:
+            session_id = getattr(event, "session_id", None)
+            if session_id:
+                self._session_id = session_id
 
         # 收集 assistant 消息（排除 reasoning）
         # 设计：
         # - is_delta=True: 累积到当前 _final_answer
         # - is_delta=False: 之前的 _final_answer 移到 _agent_messages，新消息成为 _final_answer
-        if event.category.value == "message" and getattr(event, "role", "") == "assistant":
-            content_type = getattr(event, "content_type", None)
-            # content_type 可能是枚举或字符串
-            content_type_str = content_type.value if hasattr(content_type, "value") else str(content_type)
-            if content_type_str != "reasoning":
+        if category == EventCategory.MESSAGE and getattr(event, "role", "") == "assistant":
+            # content_type 可能是枚举或字符串，str 枚举可直接比较
+            if getattr(event, "content_type", None) != ContentType.REASONING:
                 text = getattr(event, "text", "")
                 is_delta = getattr(event, "is_delta", False)
                 if text:
                     if is_delta:
-                        # Delta 消息：累积到当前答案
-                        self._final_answer += text
+                        # Delta 消息：累积到当前答案（仅追加分片）
+                        self._final_answer_parts.append(text)
                     else:
                         # 完整消息：之前的移到中间列表，新消息成为最终答案
-                        if self._final_answer:
-                            self._agent_messages.append(self._final_answer)
+                        previous = self._final_answer
+                        if previous:
+                            self._agent_messages.append(previous)
                         self._final_answer = text
 
-        raw = event.raw
+        raw_get = raw.get
 
         # 模型名称
-        if not self._debug_info.model:
-            model = raw.get("model") or raw.get("metadata", {}).get("model")
+        if not debug_info.model:
+            model = raw_get("model")
+            if not model:
+                # 显式判断，避免每个事件都分配一个空 dict 作为默认值
+                metadata = raw_get("metadata")
+                if metadata:
+                    model = metadata.get("model")
             if model:
-                self._debug_info.model = model
+                debug_info.model = model
 
-        # Token 统计
-        stats = raw.get("stats") or raw.get("usage") or {}
+        # Token 统计（多数事件没有统计字段）
+        stats = raw_get("stats") or raw_get("usage")
         if stats:
-            if stats.get("input_tokens"):
-                self._debug_info.input_tokens = stats["input_tokens"]
-            if stats.get("output_tokens"):
-                self._debug_info.output_tokens = stats["output_tokens"]
-            if stats.get("cached_input_tokens"):
-                self._debug_info.cached_input_tokens = stats["cached_input_tokens"]
-            # Gemini 格式
-            if stats.get("total_input_tokens"):
-                self._debug_info.input_tokens = stats["total_input_tokens"]
-            if stats.get("total_output_tokens"):
-                self._debug_info.output_tokens = stats["total_output_tokens"]
+            stats_get = stats.get
+            # Gemini 格式（total_*）优先
+            input_tokens = stats_get("total_input_tokens") or stats_get("input_tokens")
+            if input_tokens:
+                debug_info.input_tokens = input_tokens
+            output_tokens = stats_get("total_output_tokens") or stats_get("output_tokens")
+            if output_tokens:
+                debug_info.output_tokens = output_tokens
+            cached_input_tokens = stats_get("cached_input_tokens")
+            if cached_input_tokens:
+                debug_info.cached_input_tokens = cached_input_tokens
 
         # 工具调用计数
-        if event.category.value == "operation" and event.operation_type:
-            if event.operation_type.value in ("tool_call", "function_call", "command"):
-                self._debug_info.tool_call_count += 1
+        if category == EventCategory.OPERATION:
+            if event.operation_type in _TOOL_CALL_OPERATION_TYPES:
+                debug_info.tool_call_count += 1
 
     def _send_cancel_event(self, params: CommonParams) -> None:
         """发送取消事件到 GUI。
@@ -1225,49 +1389,17 @@ class CLIInvoker(ABC):
         Args:
             params: 调用参数
         """
-        from ..parsers import make_fallback_event, CLISource
-
-        # 创建一个合成的取消事件
-        cancel_data = {
-            "type": "system",
-            "subtype": "cancelled",
-            "severity": "warning",  # 取消是警告级别
-            "message": "Execution cancelled by user",
-            "session_id": self._session_id,
-            "source": self.cli_name,
-        }
-
-        try:
-            source = CLISource(self.cli_name)
-        except ValueError:
-            source = CLISource.UNKNOWN
-
-        event = make_fallback_event(source, cancel_data)
-
-        if self._event_callback:
-            self._event_callback(event)
+        # 创建一个合成的取消事件（取消是警告级别）
+        self._emit_system_event(
+            "cancelled",
+            "warning",
+            "Execution cancelled by user",
+            with_session_id=True,
+        )
 
     def _send_process_started_event(self) -> None:
         """发送进程启动事件到 GUI。"""
-        from ..parsers import make_fallback_event, CLISource
-
-        started_data = {
-            "type": "system",
-            "subtype": "info",
-            "severity": "info",  # 信息级别
-            "message": f"{self.cli_name} CLI started",
-            "source": self.cli_name,
-        }
-
-        try:
-            source = CLISource(self.cli_name)
-        except ValueError:
-            source = CLISource.UNKNOWN
-
-        event = make_fallback_event(source, started_data)
-
-        if self._event_callback:
-            self._event_callback(event)
+        self._emit_system_event("info", "info", f"{self.cli_name} CLI started")
 
     def _send_timeout_retry_event(self, attempt: int, max_attempts: int, timeout: float) -> None:
         """发送超时重试事件到 GUI。
@@ -1277,29 +1409,13 @@ class CLIInvoker(ABC):
             max_attempts: 最大尝试次数
             timeout: 首次事件超时时间（秒）
         """
-        from ..parsers import make_fallback_event, CLISource
-
         remaining = max_attempts - attempt
-        retry_data = {
-            "type": "system",
-            "subtype": "timeout_retry",
-            "severity": "warning",
-            "message": (
-                f"Process unresponsive (no response within {timeout:.0f}s). "
-                f"Restarting... (attempt {attempt}/{max_attempts}, {remaining} retries remaining)"
-            ),
-            "source": self.cli_name,
-        }
-
-        try:
-            source = CLISource(self.cli_name)
-        except ValueError:
-            source = CLISource.UNKNOWN
-
-        event = make_fallback_event(source, retry_data)
-
-        if self._event_callback:
-            self._event_callback(event)
+        self._emit_system_event(
+            "timeout_retry",
+            "warning",
+            f"Process unresponsive (no response within {timeout:.0f}s). "
+            f"Restarting... (attempt {attempt}/{max_attempts}, {remaining} retries remaining)",
+        )
 
     def _extract_error_from_line(self, line: str) -> tuple[str, str] | None:
         """从非 JSON 行中提取错误信息。
@@ -1314,9 +1430,11 @@ class CLIInvoker(ABC):
         if line.startswith("[STARTUP]"):
             return None
 
-        # 尝试匹配错误模式
-        for pattern, error_type in self._ERROR_PATTERNS:
-            match = re.search(pattern, line)
+        # 尝试匹配错误模式（字面量预筛：绝大多数普通日志行在这里就被排除）
+        for pattern, error_type, literal in self._ERROR_PATTERNS:
+            if literal not in line:
+                continue
+            match = pattern.search(line)
             if match:
                 # 提取错误消息
                 groups = match.groups()
@@ -1328,19 +1446,12 @@ class CLIInvoker(ABC):
                 else:
                     error_msg = line
                 # 尝试从 JSON 格式提取更详细的错误
-                json_match = re.search(r'\{.*"error".*\}', error_msg)
-                if json_match:
-                    try:
-                        error_json = json.loads(json_match.group())
-                        if "error" in error_json:
-                            err = error_json["error"]
-                            code = err.get("code", "")
-                            msg = err.get("message", "")
-                            if code and msg:
-                                error_msg = f"[{code}] {msg}"
-                    except json.JSONDecodeError:
-                        pass
-                return (error_type, error_msg)
+                return (error_type, _extract_json_error(error_msg))
+
+        # 行首形态匹配（throw / 堆栈 / 源码行 / 错误指示符），整行作为错误消息
+        match = self._ERROR_LINE_SHAPE_RE.match(line)
+        if match:
+            return (match.lastgroup, _extract_json_error(line))
 
         return None
 
@@ -1448,26 +1559,37 @@ class CLIInvoker(ABC):
             error_type: 错误子类型（error, startup_failed, exit_error, api_error, tool_error）
             severity: 严重级别（error, warning, info）
         """
-        from ..parsers import make_fallback_event, CLISource
+        self._emit_system_event(error_type, severity, message, with_session_id=True)
 
-        error_data = {
-            "type": "system",
-            "subtype": error_type,
+    def _emit_system_event(
+        self,
+        subtype: str,
+        severity: str,
+        message: str,
+        *,
+        with_session_id: bool = False,
+    ) -> None:
+        """构造合成的 system 事件并推送到 GUI。
+
+        无回调时直接返回，不构造事件。公共字段来自 self._event_base 模板。
+
+        Args:
+            subtype: 事件子类型
+            severity: 严重级别
+            message: 事件消息
+            with_session_id: 是否包含 session_id 字段（值可能为空，键始终存在）
+        """
+        if not self._event_callback:
+            return
+        data = {
+            **self._event_base,
+            "subtype": subtype,
             "severity": severity,
             "message": message,
-            "session_id": self._session_id,
-            "source": self.cli_name,
         }
-
-        try:
-            source = CLISource(self.cli_name)
-        except ValueError:
-            source = CLISource.UNKNOWN
-
-        event = make_fallback_event(source, error_data)
-
-        if self._event_callback:
-            self._event_callback(event)
+        if with_session_id:
+            data["session_id"] = self._session_id
+        self._event_callback(make_fallback_event(self._cli_source, data))
 
     async def cancel(self) -> None:
         """取消正在执行的命令。
@@ -57,6 +57,7 @@ class ClaudeInvoker(CLIInvoker):
         claude_path: str = "claude",
         event_callback: EventCallback | None = None,
         parser: Any | None = None,
+        collect_all_messages: bool = False,
     ) -> None:
         """初始化 Claude 调用器。
 
@@ -64,8 +65,13 @@ class ClaudeInvoker(CLIInvoker):
             claude_path: claude 可执行文件路径，默认 "claude"
             event_callback: 事件回调函数
             parser: 自定义解析器
+            collect_all_messages: 是否在结果中保留全部原始事件
         """
-        super().__init__(event_callback=event_callback, parser=parser)
+        super().__init__(
+            event_callback=event_callback,
+            parser=parser,
+            collect_all_messages=collect_all_messages,
+        )
         self._claude_path = claude_path
 
     @property
@@ -93,27 +99,26 @@ class ClaudeInvoker(CLIInvoker):
         Returns:
             命令行参数列表
         """
-        cmd = [self._claude_path]
-
-        # 硬编码：非交互模式
-        cmd.append("-p")
-
-        # 跳过权限确认（MCP 服务器场景下必需）
-        cmd.append("--dangerously-skip-permissions")
-
-        # 硬编码：流式 JSON 输出（需要 --verbose）
-        cmd.extend(["--output-format", "stream-json"])
-        cmd.append("--verbose")  # stream-json 在 -p 模式下需要 --verbose
-
-        # 工作目录
-        cmd.extend(["--add-dir", str(params.workspace.absolute())])
-
         # Permission 映射到 tools 参数
         # read-only: 只允许读取类工具
         # workspace-write: 允许编辑和 Bash
         # unlimited: 使用默认工具集
         tools_value = PERMISSION_MAP_CLAUDE.get(params.permission, "Read,Grep,Glob")
-        cmd.extend(["--tools", tools_value])
+
+        # 固定部分一次性构建
+        cmd = [
+            self._claude_path,
+            # 硬编码：非交互模式
+            "-p",
+            # 跳过权限确认（MCP 服务器场景下必需）
+            "--dangerously-skip-permissions",
+            # 硬编码：流式 JSON 输出（stream-json 在 -p 模式下需要 --verbose）
+            "--output-format", "stream-json",
+            "--verbose",
+            # 工作目录
+            "--add-dir", str(params.workspace.absolute()),
+            "--tools", tools_value,
+        ]
 
         # 可选：模型
         if params.model:
@@ -19,6 +19,9 @@ cli-agent-mcp shared/mcp v0.1.0
 
 from __future__ import annotations
 
+import asyncio
+import os
+import re
 from pathlib import Path
 from typing import Any
 
@@ -34,6 +37,17 @@ from .types import (
 __all__ = ["CodexInvoker"]
 
 
+def _find_missing_files(paths: list[Path]) -> list[Path]:
+    """返回不存在的文件路径（去重，每个路径只 stat 一次）。"""
+    missing: list[Path] = []
+    for path in dict.fromkeys(paths):
+        try:
+            os.stat(path)
+        except (OSError, ValueError):
+            missing.append(path)
+    return missing
+
+
 class CodexInvoker(CLIInvoker):
     """Codex CLI 调用器。
 
@@ -61,11 +75,16 @@ class CodexInvoker(CLIInvoker):
         "Reconnecting",  # 网络重连消息
     ]
 
+    # 预编译为单个交替正则，一次扫描匹配全部模式
+    _IGNORABLE_WARNINGS_RE = re.compile("|".join(re.escape(s) for s in _IGNORABLE_WARNINGS))
+    _IGNORABLE_ERRORS_RE = re.compile("|".join(re.escape(s) for s in _IGNORABLE_ERRORS))
+
     def __init__(
         self,
         codex_path: str = "codex",
         event_callback: EventCallback | None = None,
         parser: Any | None = None,
+        collect_all_messages: bool = False,
     ) -> None:
         """初始化 Codex 调用器。
 
@@ -73,23 +92,27 @@ class CodexInvoker(CLIInvoker):
             codex_path: codex 可执行文件路径，默认 "codex"
             event_callback: 事件回调函数
             parser: 自定义解析器
+            collect_all_messages: 是否在结果中保留全部原始事件
         """
-        super().__init__(event_callback=event_callback, parser=parser)
+        super().__init__(
+            event_callback=event_callback,
+            parser=parser,
+            collect_all_messages=collect_all_messages,
+        )
         self._codex_path = codex_path
 
     @property
     def cli_type(self) -> CLIType:
         return CLIType.CODEX
 
-    def validate_params(self, params: CommonParams) -> None:
-        """验证 Codex 特有参数。"""
-        super().validate_params(params)
+    async def _validate_files(self, params: CommonParams) -> None:
+        """验证图片附件存在（在线程中 stat，避免阻塞事件循环）。"""
+        await super()._validate_files(params)
 
-        if isinstance(params, CodexParams):
-            # 验证图片路径
-            for img_path in params.image:
-                if not Path(img_path).exists():
-                    raise ValueError(f"Image file does not exist: {img_path}")
+        if isinstance(params, CodexParams) and params.image:
+            missing = await asyncio.to_thread(_find_missing_files, params.image)
+            if missing:
+                raise ValueError(f"Image file does not exist: {missing[0]}")
 
     def build_command(self, params: CommonParams) -> list[str]:
         """构建 Codex CLI 命令。
@@ -100,18 +123,19 @@ class CodexInvoker(CLIInvoker):
         Returns:
             命令行参数列表
         """
-        cmd = [self._codex_path, "exec"]
-
-        # 工作目录
-        cmd.extend(["--cd", str(params.workspace.absolute())])
-
         # Permission 映射到 sandbox 参数
         sandbox_value = PERMISSION_MAP_CODEX.get(params.permission, "read-only")
-        cmd.extend(["--sandbox", sandbox_value])
 
-        # 硬编码参数
-        cmd.append("--skip-git-repo-check")
-        cmd.append("--json")
+        # 固定部分一次性构建
+        cmd = [
+            self._codex_path, "exec",
+            # 工作目录
+            "--cd", str(params.workspace.absolute()),
+            "--sandbox", sandbox_value,
+            # 硬编码参数
+            "--skip-git-repo-check",
+            "--json",
+        ]
 
         # 可选：模型
         if params.model:
@@ -124,8 +148,7 @@ class CodexInvoker(CLIInvoker):
 
         # 会话恢复
         if params.session_id:
-            cmd.append("resume")
-            cmd.append(params.session_id)
+            cmd.extend(["resume", params.session_id])
 
         # Prompt 通过 stdin 传递（使用 -- 分隔）
         cmd.append("--")
@@ -151,10 +174,7 @@ class CodexInvoker(CLIInvoker):
 
         Codex 的重连消息等不应触发致命错误。
         """
-        for pattern in self._IGNORABLE_ERRORS:
-            if pattern in error_msg:
-                return True
-        return False
+        return self._IGNORABLE_ERRORS_RE.search(error_msg) is not None
 
     def _check_execution_errors(self, stderr_content: str = "") -> None:
         """检查 Codex 执行错误，处理可忽略的警告。
@@ -166,9 +186,8 @@ class CodexInvoker(CLIInvoker):
             return
 
         # 检查是否是可忽略的警告
-        for warning in self._IGNORABLE_WARNINGS:
-            if warning in self._exit_error:
-                # 如果有实际内容，清除错误
-                if self._final_answer and self._final_answer.strip():
-                    self._exit_error = None
-                    return
+        if self._IGNORABLE_WARNINGS_RE.search(self._exit_error):
+            # 如果有实际内容，清除错误
+            if self._final_answer and self._final_answer.strip():
+                self._exit_error = None
+                return
@@ -71,6 +71,7 @@ class GeminiInvoker(CLIInvoker):
         gemini_path: str = "gemini",
         event_callback: EventCallback | None = None,
         parser: Any | None = None,
+        collect_all_messages: bool = False,
     ) -> None:
         """初始化 Gemini 调用器。
 
@@ -78,8 +79,13 @@ class GeminiInvoker(CLIInvoker):
             gemini_path: gemini 可执行文件路径，默认 "gemini"
             event_callback: 事件回调函数
             parser: 自定义解析器
+            collect_all_messages: 是否在结果中保留全部原始事件
         """
-        super().__init__(event_callback=event_callback, parser=parser)
+        super().__init__(
+            event_callback=event_callback,
+            parser=parser,
+            collect_all_messages=collect_all_messages,
+        )
         self._gemini_path = gemini_path
 
     @property
@@ -13,7 +13,7 @@ import logging
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from ..image import (
     ImageClient,
@@ -28,8 +28,33 @@ __all__ = ["ImageInvoker", "ImageParams", "ImageExecutionResult"]
 
 logger = logging.getLogger(__name__)
 
+# XML 属性值中需要转义的字符（与 html.escape(quote=True) 一致）
+_XML_SPECIAL_CHARS = frozenset("&<>\"'")
 
-@dataclass
+
+def _escape_attr(value: str) -> str:
+    """转义 XML 属性值；不含特殊字符时直接返回原字符串。"""
+    if _XML_SPECIAL_CHARS.isdisjoint(value):
+        return value
+    return html.escape(value, quote=True)
+
+
+def _resolve_image(source: str) -> str:
+    """将绝对图片路径解析为真实路径（跟随符号链接）。
+
+    每次调用都重新检查文件是否存在：图片可能在两次调用之间被删除或替换。
+
+    Raises:
+        FileNotFoundError: 图片不存在
+        OSError, ValueError: 路径无效
+    """
+    resolved_path = Path(source).resolve()
+    if not resolved_path.exists():
+        raise FileNotFoundError(str(resolved_path))
+    return str(resolved_path)
+
+
+@dataclass(slots=True)
 class ImageParams:
     """Image 调用参数。
 
@@ -55,7 +80,7 @@ class ImageParams:
     api_type: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageExecutionResult:
     """Image 执行结果。
 
@@ -91,6 +116,26 @@ class ImageInvoker:
         ))
     """
 
+    # 客户端事件类型 -> (subtype, severity, 消息构造函数)；不在表中的事件直接忽略
+    _EVENT_TYPE_MAP: dict[str, tuple[str, str | None, Callable[[dict[str, Any]], str]]] = {
+        "generation_started": (
+            "info", None,
+            lambda e: f"Processing: {e.get('prompt', '')[:50]}...",
+        ),
+        "generation_completed": (
+            "info", None,
+            lambda e: f"Generated {e.get('artifact_count', 0)} image(s)",
+        ),
+        "generation_failed": (
+            "error", "error",
+            lambda e: f"Failed: {e.get('error', 'Unknown error')}",
+        ),
+        "api_retry": (
+            "warning", "warning",
+            lambda e: f"API error {e.get('status_code')}, retrying in {e.get('delay')}s...",
+        ),
+    }
+
     def __init__(
         self,
         event_callback: EventCallback | None = None,
@@ -117,54 +162,21 @@ class ImageInvoker:
         if not self._event_callback:
             return
 
-        event_type = event.get("type", "")
-
-        if event_type == "generation_started":
-            unified = make_fallback_event(
-                CLISource.UNKNOWN,
-                {
-                    "type": "system",
-                    "subtype": "info",
-                    "message": f"Processing: {event.get('prompt', '')[:50]}...",
-                    "source": "image",
-                },
-            )
-        elif event_type == "generation_completed":
-            unified = make_fallback_event(
-                CLISource.UNKNOWN,
-                {
-                    "type": "system",
-                    "subtype": "info",
-                    "message": f"Generated {event.get('artifact_count', 0)} image(s)",
-                    "source": "image",
-                },
-            )
-        elif event_type == "generation_failed":
-            unified = make_fallback_event(
-                CLISource.UNKNOWN,
-                {
-                    "type": "system",
-                    "subtype": "error",
-                    "severity": "error",
-                    "message": f"Failed: {event.get('error', 'Unknown error')}",
-                    "source": "image",
-                },
-            )
-        elif event_type == "api_retry":
-            unified = make_fallback_event(
-                CLISource.UNKNOWN,
-                {
-                    "type": "system",
-                    "subtype": "warning",
-                    "severity": "warning",
-                    "message": f"API error {event.get('status_code')}, retrying in {event.get('delay')}s...",
-                    "source": "image",
-                },
-            )
-        else:
+        spec = self._EVENT_TYPE_MAP.get(event.get("type", ""))
+        if spec is None:
             return
 
-        self._event_callback(unified)
+        subtype, severity, format_message = spec
+        data = {
+            "type": "system",
+            "subtype": subtype,
+            "message": format_message(event),
+            "source": "image",
+        }
+        if severity is not None:
+            data["severity"] = severity
+
+        self._event_callback(make_fallback_event(CLISource.UNKNOWN, data))
 
     def _parse_images(self, images: list[dict[str, Any]]) -> list[ImageInput]:
         """解析图片输入列表。
@@ -178,51 +190,47 @@ class ImageInvoker:
             if not source:
                 continue
 
-            source_path = Path(source)
-            if not source_path.is_absolute():
+            if not Path(source).is_absolute():
                 logger.warning(f"Skipping non-absolute image path: {source}")
                 continue
 
             # Resolve to real path (follows symlinks)
             try:
-                resolved_path = source_path.resolve()
+                resolved_path = _resolve_image(source)
+            except FileNotFoundError as e:
+                logger.warning(f"Skipping non-existent image: {e}")
+                continue
             except (OSError, ValueError) as e:
                 logger.warning(f"Skipping invalid image path {source}: {e}")
                 continue
 
-            if not resolved_path.exists():
-                logger.warning(f"Skipping non-existent image: {resolved_path}")
-                continue
-
-            result.append(ImageInput(source=str(resolved_path)))
+            result.append(ImageInput(source=resolved_path))
 
         return result
 
-    def _build_response_xml(self, response: ImageResponse) -> str:
-        request_id = html.escape(response.request_id, quote=True)
-        model = html.escape(response.model, quote=True)
+    def _iter_response_xml(self, response: ImageResponse) -> Iterator[str]:
+        """逐行产出 XML 响应（不含换行符），调用方可直接流式写出。"""
+        esc = _escape_attr
+        request_id = esc(response.request_id)
+        model = esc(response.model)
 
-        lines = [
-            f'<image-response request_id="{request_id}" model="{model}">'
-        ]
+        yield f'<image-response request_id="{request_id}" model="{model}">'
 
         if response.text_content:
-            lines.append(f'  <text>{_escape_xml(response.text_content)}</text>')
+            yield f'  <text>{escape_xml(response.text_content)}</text>'
 
         for artifact in response.artifacts:
-            artifact_id = html.escape(artifact.id, quote=True)
-            kind = html.escape(artifact.kind, quote=True)
-            mime_type = html.escape(artifact.mime_type, quote=True)
-            path = html.escape(artifact.path, quote=True)
-            sha256 = html.escape(artifact.sha256, quote=True)
-            lines.append(
-                f'  <artifact id="{artifact_id}" kind="{kind}" '
-                f'mime_type="{mime_type}" path="{path}" '
-                f'sha256="{sha256}"/>'
+            # sha256 是十六进制字符串，无需转义
+            yield (
+                f'  <artifact id="{esc(artifact.id)}" kind="{esc(artifact.kind)}" '
+                f'mime_type="{esc(artifact.mime_type)}" path="{esc(artifact.path)}" '
+                f'sha256="{artifact.sha256}"/>'
             )
 
-        lines.append('</image-response>')
-        return '\n'.join(lines)
+        yield '</image-response>'
+
+    def _build_response_xml(self, response: ImageResponse) -> str:
+        return '\n'.join(self._iter_response_xml(response))
 
     async def execute(self, params: ImageParams) -> ImageExecutionResult:
         start_time = time.time()
@@ -24,7 +24,6 @@ from __future__ import annotations
 
 import json
 import os
-import re
 from typing import Any
 
 from .base import CLIInvoker, EventCallback
@@ -37,19 +36,33 @@ from .types import (
 
 __all__ = ["OpencodeInvoker"]
 
-# OpenCode 错误模式匹配
-_OPENCODE_ERROR_PATTERNS = [
-    # 错误类名（如 ProviderModelNotFoundError: ...）
-    (r'^(\w+Error):\s*(.*)$', 'error'),
-    # 堆栈跟踪指示符
-    (r'^\s*\^$', 'stacktrace'),
-    # throw 语句
-    (r'throw new (\w+)', 'throw'),
-    # at ... 堆栈位置
-    (r'^\s+at\s+\w+', 'stacktrace'),
-    # data: { ... } 错误数据块开始
-    (r'^\s*data:\s*\{', 'error_data'),
-]
+# Permission 到 OpenCode 权限配置的映射
+_PERMISSION_CONFIGS: dict[Permission, dict[str, str]] = {
+    # 只读模式：禁止编辑和执行
+    Permission.READ_ONLY: {
+        "edit": "deny",
+        "bash": "deny",
+        "webfetch": "deny",
+    },
+    # 工作区写入模式：允许编辑，bash 需要确认
+    Permission.WORKSPACE_WRITE: {
+        "edit": "allow",
+        "bash": "ask",
+        "webfetch": "ask",
+    },
+    # 无限制模式：允许所有操作
+    Permission.UNLIMITED: {
+        "edit": "allow",
+        "bash": "allow",
+        "webfetch": "allow",
+        "external_directory": "allow",
+    },
+}
+
+# 预先序列化的 OPENCODE_PERMISSION 环境变量值（每个权限级别只 dumps 一次）
+_PERMISSION_JSON: dict[Permission, str] = {
+    permission: json.dumps(config) for permission, config in _PERMISSION_CONFIGS.items()
+}
 
 
 class OpencodeInvoker(CLIInvoker):
@@ -74,6 +87,7 @@ class OpencodeInvoker(CLIInvoker):
         opencode_path: str = "opencode",
         event_callback: EventCallback | None = None,
         parser: Any | None = None,
+        collect_all_messages: bool = False,
     ) -> None:
         """初始化 OpenCode 调用器。
 
@@ -81,8 +95,13 @@ class OpencodeInvoker(CLIInvoker):
             opencode_path: opencode 可执行文件路径，默认 "opencode"
             event_callback: 事件回调函数
             parser: 自定义解析器
+            collect_all_messages: 是否在结果中保留全部原始事件
         """
-        super().__init__(event_callback=event_callback, parser=parser)
+        super().__init__(
+            event_callback=event_callback,
+            parser=parser,
+            collect_all_messages=collect_all_messages,
+        )
         self._opencode_path = opencode_path
 
     @property
@@ -138,16 +157,15 @@ class OpencodeInvoker(CLIInvoker):
         Returns:
             环境变量字典（包含系统环境），或 None 使用默认
         """
-        # 继承系统环境变量
-        env = dict(os.environ)
-
         # Permission 映射到 OPENCODE_PERMISSION 环境变量
         # OpenCode 的权限模型与其他 CLI 不同，使用 JSON 格式的配置
-        permission_config = self._build_permission_config(params.permission)
-        if permission_config:
-            env["OPENCODE_PERMISSION"] = json.dumps(permission_config)
+        # 配置只取决于权限级别，直接使用预先序列化的 JSON
+        permission_json = _PERMISSION_JSON.get(params.permission)
+        if permission_json is None:
+            return None
 
-        return env
+        # 继承系统环境变量（一次性合并构建，不再先复制再赋值）
+        return {**os.environ, "OPENCODE_PERMISSION": permission_json}
 
     def _build_permission_config(self, permission: Permission) -> dict[str, Any]:
         """构建 OpenCode 权限配置。
@@ -158,28 +176,7 @@ class OpencodeInvoker(CLIInvoker):
         Returns:
             OpenCode 权限配置字典
         """
-        if permission == Permission.READ_ONLY:
-            # 只读模式：禁止编辑和执行
-            return {
-                "edit": "deny",
-                "bash": "deny",
-                "webfetch": "deny",
-            }
-        elif permission == Permission.WORKSPACE_WRITE:
-            # 工作区写入模式：允许编辑，bash 需要确认
-            return {
-                "edit": "allow",
-                "bash": "ask",
-                "webfetch": "ask",
-            }
-        else:  # UNLIMITED
-            # 无限制模式：允许所有操作
-            return {
-                "edit": "allow",
-                "bash": "allow",
-                "webfetch": "allow",
-                "external_directory": "allow",
-            }
+        return dict(_PERMISSION_CONFIGS.get(permission, _PERMISSION_CONFIGS[Permission.UNLIMITED]))
 
     @property
     def uses_stdin_prompt(self) -> bool:
@@ -199,13 +196,19 @@ class OpencodeInvoker(CLIInvoker):
             (error_type, error_message) 元组，如果不是错误行则返回 None
         """
         # 检查是否是主错误行（如 ProviderModelNotFoundError: ...）
-        match = re.match(r'^(\w+Error):\s*(.*)$', line)
-        if match:
-            error_name = match.group(1)
-            error_msg = match.group(2) or error_name
-            return (error_name, error_msg)
-
-        return None
+        # 对应 ^(\w+Error):\s*(.*)$，用字符串方法实现，不经过正则引擎；
+        # 消息两端的空白（含行尾换行）一并去除
+        if "Error:" not in line:
+            return None
+        colon = line.find(":")
+        # 冒号前至少需要 1 个字符 + "Error"
+        if colon <= 5:
+            return None
+        error_name = line[:colon]
+        if not error_name.endswith("Error") or not error_name.replace("_", "a").isalnum():
+            return None
+        error_msg = line[colon + 1:].strip() or error_name
+        return (error_name, error_msg)
 
     def _process_event(self, event: Any, params: CommonParams) -> None:
         """处理 OpenCode 特有的事件。
@@ -8,7 +8,7 @@ cli-agent-mcp shared/mcp v0.1.0
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Any, Literal
@@ -54,6 +54,9 @@ class CLIType(str, Enum):
     IMAGE = "image"
 
 
+# 字符串 -> Permission 直查表，绕过 Enum.__call__ 的开销（成员本身也可作为键）
+_PERMISSION_LOOKUP: dict[str, Permission] = Permission._value2member_map_  # type: ignore[assignment]
+
 # Permission 到 Codex sandbox 参数的映射
 PERMISSION_MAP_CODEX: dict[Permission, str] = {
     Permission.READ_ONLY: "read-only",
@@ -69,7 +72,7 @@ PERMISSION_MAP_CLAUDE: dict[Permission, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class CommonParams:
     """公共参数。
 
@@ -94,14 +97,18 @@ class CommonParams:
     task_tags: list[str] = field(default_factory=list)
 
     def __post_init__(self) -> None:
-        """确保 workspace 是 Path 对象，permission 是枚举。"""
-        if isinstance(self.workspace, str):
+        """确保 workspace 是 Path 对象，permission 是枚举。
+
+        用精确类型比较代替 isinstance：Permission 成员本身是 str 子类，无需再转换。
+        """
+        if self.workspace.__class__ is str:
             self.workspace = Path(self.workspace)
-        if isinstance(self.permission, str):
-            self.permission = Permission(self.permission)
+        if self.permission.__class__ is str:
+            # 非法值回退到 Permission() 以抛出标准 ValueError
+            self.permission = _PERMISSION_LOOKUP.get(self.permission) or Permission(self.permission)
 
 
-@dataclass
+@dataclass(slots=True)
 class CodexParams(CommonParams):
     """Codex CLI 参数。
 
@@ -114,12 +121,13 @@ class CodexParams(CommonParams):
     image: list[Path] = field(default_factory=list)
 
     def __post_init__(self) -> None:
-        super().__post_init__()
+        # slots=True 会重建类，零参数 super() 在此不可用
+        CommonParams.__post_init__(self)
         # 确保 image 是 Path 列表
-        self.image = [Path(p) if isinstance(p, str) else p for p in self.image]
+        self.image = [Path(p) if p.__class__ is str else p for p in self.image]
 
 
-@dataclass
+@dataclass(slots=True)
 class GeminiParams(CommonParams):
     """Gemini CLI 参数。
 
@@ -129,7 +137,7 @@ class GeminiParams(CommonParams):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ClaudeParams(CommonParams):
     """Claude CLI 参数。
 
@@ -146,7 +154,7 @@ class ClaudeParams(CommonParams):
     agent: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class OpencodeParams(CommonParams):
     """OpenCode CLI 参数。
 
@@ -161,16 +169,16 @@ class OpencodeParams(CommonParams):
     agent: str = "build"
 
     def __post_init__(self) -> None:
-        super().__post_init__()
+        CommonParams.__post_init__(self)
         # 确保 file 是 Path 列表
-        self.file = [Path(p) if isinstance(p, str) else p for p in self.file]
+        self.file = [Path(p) if p.__class__ is str else p for p in self.file]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GUIMetadata:
     """GUI 元数据。
 
-    随执行结果返回的 GUI 显示信息。
+    随执行结果返回的 GUI 显示信息（构造后不可变）。
 
     Attributes:
         task_note: 任务备注
@@ -187,7 +195,11 @@ class GUIMetadata:
     end_time: float = 0.0
 
 
-@dataclass
+# DebugInfo 中仅在非 None 时输出的字段（按输出顺序）
+_DEBUG_OPTIONAL_KEYS = ("input_tokens", "output_tokens", "cached_input_tokens", "exit_code")
+
+
+@dataclass(slots=True)
 class DebugInfo:
     """调试信息。
 
@@ -223,25 +235,22 @@ class DebugInfo:
             "message_count": self.message_count,
             "tool_call_count": self.tool_call_count,
         }
-        # 仅当有值时才包含 token 统计（None 表示未知）
-        if self.input_tokens is not None:
-            result["input_tokens"] = self.input_tokens
-        if self.output_tokens is not None:
-            result["output_tokens"] = self.output_tokens
-        if self.cached_input_tokens is not None:
-            result["cached_input_tokens"] = self.cached_input_tokens
-        if self.exit_code is not None:
-            result["exit_code"] = self.exit_code
+        # 仅当有值时才包含 token 统计与退出码（None 表示未知）
+        for key in _DEBUG_OPTIONAL_KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                result[key] = value
         if self.cancelled:
             result["cancelled"] = self.cancelled
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutionResult:
     """执行结果。
 
-    CLI 调用返回的统一结果结构。
+    CLI 调用返回的统一结果结构。构造后不可变，
+    需要修改字段时请使用 dataclasses.replace 生成新实例。
 
     Attributes:
         success: 执行是否成功
@@ -249,6 +258,7 @@ class ExecutionResult:
         agent_messages: 最终答案（最后一条 agent 回复）
         thought_steps: 中间思考步骤（除最后一条外的 agent 消息）
         error: 错误信息（仅失败时）
+        all_messages: 全部原始事件（仅 collect_all_messages=True 时收集）
         log_file: 日志文件路径
         gui_metadata: GUI 元数据
         debug_info: 调试信息（仅 debug=True）
@@ -258,8 +268,9 @@ class ExecutionResult:
     success: bool
     session_id: str = ""
     agent_messages: str = ""  # 最终答案
-    thought_steps: list[str] = field(default_factory=list)  # 中间消息
+    thought_steps: tuple[str, ...] = ()  # 中间消息（只读）
     error: str | None = None
+    all_messages: list[dict[str, Any]] | None = None
     log_file: str | None = None
     gui_metadata: GUIMetadata | None = None
     debug_info: DebugInfo | None = None
@@ -281,13 +292,7 @@ class ExecutionResult:
         if self.log_file:
             result["log_file"] = self.log_file
         if self.gui_metadata:
-            result["gui_metadata"] = {
-                "task_note": self.gui_metadata.task_note,
-                "task_tags": self.gui_metadata.task_tags,
-                "source": self.gui_metadata.source,
-                "start_time": self.gui_metadata.start_time,
-                "end_time": self.gui_metadata.end_time,
-            }
+            result["gui_metadata"] = asdict(self.gui_metadata)
         if self.debug_info:
             result["debug_info"] = self.debug_info.to_dict()
         return result
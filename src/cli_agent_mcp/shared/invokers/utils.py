@@ -10,8 +10,28 @@ import re
 __all__ = [
     "sanitize_task_note",
     "escape_xml",
+    "escape_xml_text",
 ]
 
+# 连续的非单词字符（含 "-"）：替换非法字符与合并连续 "-" 可一次完成
+_NON_WORD_RUN = re.compile(r"\W+")
+
+# XML 特殊字符转义表（str.translate 单次扫描完成全部替换）
+_XML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&apos;",
+})
+
+# 元素文本只需转义 & < >（引号仅在属性值中有意义）
+_XML_TEXT_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+})
+
 
 def sanitize_task_note(name: str) -> str:
     """将 task_note 转换为安全的文件名前缀。
@@ -24,9 +44,7 @@ def sanitize_task_note(name: str) -> str:
     """
     if not name:
         return ""
-    sanitized = re.sub(r'[^\w\-]', '-', name)
-    sanitized = re.sub(r'-+', '-', sanitized)
-    return sanitized.strip('-')[:50]
+    return _NON_WORD_RUN.sub('-', name).strip('-')[:50]
 
 
 def escape_xml(text: str) -> str:
@@ -38,11 +56,16 @@ def escape_xml(text: str) -> str:
     Returns:
         转义后的文本
     """
-    return (
-        text
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&apos;")
-    )
+    return text.translate(_XML_ESCAPE_TABLE)
+
+
+def escape_xml_text(text: str) -> str:
+    """转义 XML 元素文本（仅 & < >，保留引号原样）。
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        转义后的文本
+    """
+    return text.translate(_XML_TEXT_ESCAPE_TABLE)
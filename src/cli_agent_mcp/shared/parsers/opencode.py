@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import json
 import time
-from typing import Any
+from typing import Any, Callable
 
 from .base import CLISource, ContentType, OperationType, Status
 from .unified import (
@@ -30,12 +30,52 @@ from .unified import (
     make_fallback_event,
 )
 
+# 可选：orjson 的缩进序列化远快于标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 __all__ = [
     "parse_opencode_event",
     "OpencodeParser",
 ]
 
 
+# 热路径常用枚举成员绑定为模块常量，省去每次的类属性查找
+_OPENCODE = CLISource.OPENCODE
+_S_SUCCESS, _S_RUNNING, _S_FAILED = Status.SUCCESS, Status.RUNNING, Status.FAILED
+_OP_TOOL = OperationType.TOOL
+_CT_TEXT = ContentType.TEXT
+
+# tool_use 事件 state.status -> Status
+_STATUS_MAP: dict[str, Status] = {
+    "completed": _S_SUCCESS,
+    "running": _S_RUNNING,
+    "failed": _S_FAILED,
+    "error": _S_FAILED,
+}
+
+# 序列化选项一次算好；标准库回退路径复用同一个编码器，
+# 省去 json.dumps 每次构造 JSONEncoder 的开销
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+_JSON_ENCODE = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+
+def _dump_tool_input(input_data: Any) -> str:
+    """将工具输入格式化为缩进 JSON，失败时退化为 str()。"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(input_data, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            # orjson 不支持的类型（如超大整数），交给标准库再试
+            pass
+    try:
+        return _JSON_ENCODE(input_data)
+    except (TypeError, ValueError):
+        return str(input_data)
+
+
 class OpencodeParser:
     """OpenCode CLI 事件解析器。
 
@@ -62,41 +102,32 @@ class OpencodeParser:
         Returns:
             统一事件实例
         """
+        # 从事件中提取 sessionID
+        session_id = data.get("sessionID", "")
+        if session_id and not self.session_id:
+            self.session_id = session_id
+
+        return self._dispatch(data, self.session_id)
+
+    @classmethod
+    def _dispatch(cls, data: dict[str, Any], session_id: str | None) -> UnifiedEvent:
+        """按事件类型分发解析（不读写实例状态）。"""
         event_type = data.get("type", "")
         timestamp = data.get("timestamp", time.time() * 1000)
         # OpenCode 使用毫秒时间戳，转换为秒
         if timestamp > 10000000000:  # 如果是毫秒
             timestamp = timestamp / 1000
 
-        # 从事件中提取 sessionID
-        session_id = data.get("sessionID", "")
-        if session_id and not self.session_id:
-            self.session_id = session_id
-
-        base_kwargs = {
-            "source": CLISource.OPENCODE,
-            "timestamp": timestamp,
-            "raw": data,
-            "session_id": self.session_id,
-        }
-
-        # 分发到具体的解析方法
-        if event_type == "tool_use":
-            return self._parse_tool_use(data, base_kwargs)
-        elif event_type == "step_start":
-            return self._parse_step_start(data, base_kwargs)
-        elif event_type == "step_finish":
-            return self._parse_step_finish(data, base_kwargs)
-        elif event_type == "text":
-            return self._parse_text(data, base_kwargs)
-        elif event_type == "error":
-            return self._parse_error(data, base_kwargs)
-        else:
+        # 分发到具体的解析方法（公共字段直接按位置传入，不再构造 kwargs 字典）
+        handler = cls._HANDLERS.get(event_type)
+        if handler is None:
             # Fallback: 未识别的事件类型
-            return make_fallback_event(CLISource.OPENCODE, data)
+            return make_fallback_event(_OPENCODE, data)
+        return handler(data, timestamp, session_id)
 
+    @staticmethod
     def _parse_tool_use(
-        self, data: dict[str, Any], base: dict[str, Any]
+        data: dict[str, Any], timestamp: float, session_id: str | None
     ) -> OperationEvent:
         """解析 tool_use 事件。"""
         part = data.get("part", {})
@@ -104,62 +135,62 @@ class OpencodeParser:
         state = part.get("state", {})
 
         # 获取工具输入参数
-        input_data = state.get("input", {})
-        try:
-            input_str = json.dumps(input_data, ensure_ascii=False, indent=2)
-        except (TypeError, ValueError):
-            input_str = str(input_data)
+        input_str = _dump_tool_input(state.get("input", {}))
 
         # 获取工具输出
         output = state.get("output", "")
         title = state.get("title", "")
 
-        # 确定状态
-        status_str = state.get("status", "completed")
-        if status_str == "completed":
-            status = Status.SUCCESS
-        elif status_str == "running":
-            status = Status.RUNNING
-        elif status_str == "failed" or status_str == "error":
-            status = Status.FAILED
-        else:
-            status = Status.SUCCESS
+        # 确定状态（未知状态视为成功）
+        status = _STATUS_MAP.get(state.get("status", "completed"), _S_SUCCESS)
 
         return OperationEvent(
             event_id=make_event_id("opencode", f"tool_{tool_name}"),
-            operation_type=OperationType.TOOL,
+            operation_type=_OP_TOOL,
             name=tool_name,
             input=input_str,
             output=output or title,
             status=status,
             metadata={"state": state, "title": title},
-            **base,
+            source=_OPENCODE,
+            timestamp=timestamp,
+            raw=data,
+            session_id=session_id,
         )
 
+    @staticmethod
     def _parse_step_start(
-        self, data: dict[str, Any], base: dict[str, Any]
+        data: dict[str, Any], timestamp: float, session_id: str | None
     ) -> LifecycleEvent:
         """解析 step_start 事件。"""
         return LifecycleEvent(
             event_id=make_event_id("opencode", "step_start"),
             lifecycle_type="turn_start",
-            status=Status.RUNNING,
-            **base,
+            status=_S_RUNNING,
+            source=_OPENCODE,
+            timestamp=timestamp,
+            raw=data,
+            session_id=session_id,
         )
 
+    @staticmethod
     def _parse_step_finish(
-        self, data: dict[str, Any], base: dict[str, Any]
+        data: dict[str, Any], timestamp: float, session_id: str | None
     ) -> LifecycleEvent:
         """解析 step_finish 事件。"""
         return LifecycleEvent(
             event_id=make_event_id("opencode", "step_finish"),
             lifecycle_type="turn_end",
-            status=Status.SUCCESS,
-            **base,
+            status=_S_SUCCESS,
+            source=_OPENCODE,
+            timestamp=timestamp,
+            raw=data,
+            session_id=session_id,
         )
 
+    @staticmethod
     def _parse_text(
-        self, data: dict[str, Any], base: dict[str, Any]
+        data: dict[str, Any], timestamp: float, session_id: str | None
     ) -> MessageEvent:
         """解析 text 事件。"""
         part = data.get("part", {})
@@ -171,15 +202,19 @@ class OpencodeParser:
 
         return MessageEvent(
             event_id=make_event_id("opencode", "text"),
-            content_type=ContentType.TEXT,
+            content_type=_CT_TEXT,
             role="assistant",
             text=text,
             is_delta=is_delta,
-            **base,
+            source=_OPENCODE,
+            timestamp=timestamp,
+            raw=data,
+            session_id=session_id,
         )
 
+    @staticmethod
     def _parse_error(
-        self, data: dict[str, Any], base: dict[str, Any]
+        data: dict[str, Any], timestamp: float, session_id: str | None
     ) -> SystemEvent:
         """解析 error 事件。"""
         error = data.get("error", {})
@@ -194,15 +229,27 @@ class OpencodeParser:
             event_id=make_event_id("opencode", "error"),
             severity="error",
             message=message,
-            **base,
+            source=_OPENCODE,
+            timestamp=timestamp,
+            raw=data,
+            session_id=session_id,
         )
 
+    # 事件类型 -> 解析函数（均不依赖实例状态，类级共享）
+    _HANDLERS: dict[str, Callable[[dict[str, Any], float, str | None], UnifiedEvent]] = {
+        "tool_use": _parse_tool_use,
+        "step_start": _parse_step_start,
+        "step_finish": _parse_step_finish,
+        "text": _parse_text,
+        "error": _parse_error,
+    }
+
 
 def parse_opencode_event(data: dict[str, Any]) -> UnifiedEvent:
     """无状态解析单个 OpenCode 事件。
 
-    注意: 此函数不维护状态。
-    如需完整功能，请使用 OpencodeParser 类。
+    注意: 此函数不维护状态（session_id 仅取自当前事件）。
+    如需跨事件关联会话，请自行创建 OpencodeParser 实例。
 
     Args:
         data: 原始事件字典
@@ -210,5 +257,5 @@ def parse_opencode_event(data: dict[str, Any]) -> UnifiedEvent:
     Returns:
         统一事件实例
     """
-    parser = OpencodeParser()
-    return parser.parse(data)
+    # 解析逻辑不依赖实例，直接走类级分发，无需每次创建临时解析器
+    return OpencodeParser._dispatch(data, data.get("sessionID") or None)
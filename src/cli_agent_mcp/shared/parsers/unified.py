@@ -6,18 +6,18 @@ cli-agent-mcp shared/parsers v0.1.0
 将不同 CLI 的事件格式统一为 GUI 可消费的标准模型。
 设计原则：
 1. 粗粒度分类 - 按 GUI 行为分为 4 大类
-2. 向前兼容 - 使用 extra='ignore' 忽略未知字段
+2. 轻量 - 内部数据载体，使用 slots dataclass，不做运行时校验
 3. Fallback 友好 - 保留 raw 字段用于 Debug
 """
 
 from __future__ import annotations
 
+import itertools
 import json
+import os
 import time
-import uuid
-from typing import Any, Literal
-
-from pydantic import BaseModel, ConfigDict, Field
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Literal
 
 from .base import (
     CLISource,
@@ -43,42 +43,53 @@ __all__ = [
 ]
 
 
+# 事件 ID 后缀：进程盐 + 进程内递增计数，避免每个事件调用 uuid4()
+_EVENT_ID_SALT = f"{os.getpid():x}{int(time.time()):x}"
+_EVENT_COUNTER = itertools.count()
+
+
 def make_event_id(source: str, hint: str = "") -> str:
     """生成事件 ID。
 
-    格式: {source}_{hint}_{uuid短码}
+    格式: {source}_{hint}_{进程盐}{自增序号}
+
+    ID 仅用于 GUI 去重，无需不可预测性；进程盐区分不同进程/启动。
     """
-    short_uuid = uuid.uuid4().hex[:8]
+    suffix = f"{_EVENT_ID_SALT}{next(_EVENT_COUNTER):x}"
     if hint:
-        return f"{source}_{hint}_{short_uuid}"
-    return f"{source}_{short_uuid}"
+        return f"{source}_{hint}_{suffix}"
+    return f"{source}_{suffix}"
 
 
-class UnifiedEventBase(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class UnifiedEventBase:
     """所有统一事件的基类。
 
     Attributes:
         event_id: 唯一 ID，用于去重和 UI 更新
         timestamp: Unix 时间戳（秒）
         source: CLI 来源标识
-        category: 事件分类
+        category: 事件分类（由子类以类常量给出）
         session_id: 会话 ID（可选）
         raw: 原始数据，用于 Debug 或 Fallback 展示
     """
 
-    model_config = ConfigDict(
-        extra="ignore",
-        frozen=False,
-    )
+    category: ClassVar[EventCategory]
 
-    event_id: str = Field(default_factory=lambda: make_event_id("unknown"))
-    timestamp: float = Field(default_factory=time.time)
+    event_id: str = field(default_factory=lambda: make_event_id("unknown"))
+    timestamp: float = field(default_factory=time.time)
     source: CLISource = CLISource.UNKNOWN
-    category: EventCategory
     session_id: str | None = None
-    raw: dict[str, Any] = Field(default_factory=dict)
+    raw: dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典（浅拷贝，供 GUI 推送）。"""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["category"] = self.category
+        return data
 
+
+@dataclass(slots=True, kw_only=True)
 class LifecycleEvent(UnifiedEventBase):
     """生命周期事件。
 
@@ -89,7 +100,7 @@ class LifecycleEvent(UnifiedEventBase):
     GUI 用途: 进度条、Spinner、会话状态指示
     """
 
-    category: Literal[EventCategory.LIFECYCLE] = EventCategory.LIFECYCLE
+    category: ClassVar[EventCategory] = EventCategory.LIFECYCLE
     lifecycle_type: Literal[
         "session_start",
         "turn_start",
@@ -98,9 +109,10 @@ class LifecycleEvent(UnifiedEventBase):
     ]
     model: str | None = None
     status: Status = Status.SUCCESS
-    stats: dict[str, Any] = Field(default_factory=dict)
+    stats: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(slots=True, kw_only=True)
 class MessageEvent(UnifiedEventBase):
     """消息/内容事件。
 
@@ -111,13 +123,14 @@ class MessageEvent(UnifiedEventBase):
     GUI 用途: 聊天气泡、Markdown 渲染
     """
 
-    category: Literal[EventCategory.MESSAGE] = EventCategory.MESSAGE
+    category: ClassVar[EventCategory] = EventCategory.MESSAGE
     content_type: ContentType = ContentType.TEXT
     role: Literal["user", "assistant"] = "assistant"
     text: str = ""
     is_delta: bool = False  # True=增量更新, False=全量
 
 
+@dataclass(slots=True, kw_only=True)
 class OperationEvent(UnifiedEventBase):
     """操作/工具事件。
 
@@ -129,7 +142,7 @@ class OperationEvent(UnifiedEventBase):
     GUI 用途: 工具调用卡片、命令终端视图、文件变更列表
     """
 
-    category: Literal[EventCategory.OPERATION] = EventCategory.OPERATION
+    category: ClassVar[EventCategory] = EventCategory.OPERATION
     operation_type: OperationType
     name: str = ""              # 工具名 或 命令
     operation_id: str | None = None  # 用于关联 call 和 result
@@ -137,9 +150,10 @@ class OperationEvent(UnifiedEventBase):
     output: str | None = None   # 执行结果
     status: Status = Status.RUNNING
     # 特定类型的额外元数据（使用 Dict 保持灵活性）
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(slots=True, kw_only=True)
 class SystemEvent(UnifiedEventBase):
     """系统/错误事件。
 
@@ -151,7 +165,7 @@ class SystemEvent(UnifiedEventBase):
     GUI 用途: Toast 提示、Debug 面板
     """
 
-    category: Literal[EventCategory.SYSTEM] = EventCategory.SYSTEM
+    category: ClassVar[EventCategory] = EventCategory.SYSTEM
     severity: Literal["debug", "info", "warning", "error"] = "info"
     message: str = ""
     is_fallback: bool = False  # True 表示这是未识别事件的 fallback
@@ -160,6 +174,20 @@ class SystemEvent(UnifiedEventBase):
 # 统一联合类型
 UnifiedEvent = LifecycleEvent | MessageEvent | OperationEvent | SystemEvent
 
+# SystemEvent.severity 的合法取值
+_VALID_SEVERITIES = frozenset({"debug", "info", "warning", "error"})
+
+
+def _stringify_message(value: Any) -> str:
+    """将 message 转为字符串：str 原样返回，其余尝试 JSON 序列化。"""
+    # 绝大多数是纯 str，精确类型比较先行，跳过 isinstance 的 MRO 检查
+    if value.__class__ is str or isinstance(value, str):
+        return value
+    try:
+        return json.dumps(value, ensure_ascii=False, default=str)
+    except Exception:
+        return str(value)
+
 
 def make_fallback_event(
     source: CLISource,
@@ -184,18 +212,12 @@ def make_fallback_event(
 
     # 从 raw 提取 severity，默认 debug
     severity = raw.get("severity", "debug")
-    if severity not in ("debug", "info", "warning", "error"):
+    if severity not in _VALID_SEVERITIES:
         severity = "debug"
 
     # 从 raw 提取 message，或使用默认
     candidate_message = message or raw.get("message") or f"Unknown event type: {event_type}"
-    if isinstance(candidate_message, str):
-        final_message = candidate_message
-    else:
-        try:
-            final_message = json.dumps(candidate_message, ensure_ascii=False, default=str)
-        except Exception:
-            final_message = str(candidate_message)
+    final_message = _stringify_message(candidate_message)
 
     # 如果有明确的 severity/message，说明这是合成事件而非未知事件
     is_fallback = raw.get("severity") is None and raw.get("message") is None
@@ -11,13 +11,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .invokers.utils import escape_xml_text
 
 if TYPE_CHECKING:
     from mcp.types import TextContent
 
 
-@dataclass
+@dataclass(slots=True)
 class DebugInfo:
     """调试信息。"""
 
@@ -55,7 +57,7 @@ class DebugInfo:
         return data
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseData:
     """响应数据。"""
 
@@ -66,7 +68,7 @@ class ResponseData:
     session_id: str = ""
 
     # 中间思考过程（可选，错误时使用）
-    thought_steps: list[str] = field(default_factory=list)
+    thought_steps: Sequence[str] = field(default_factory=list)
 
     # 调试信息（可选，debug 时使用）
     debug_info: DebugInfo | None = None
@@ -77,6 +79,9 @@ class ResponseData:
     # 错误信息
     error: str | None = None
 
+    # answer 已是 XML（如 parallel 的 <agent-output> 包装），原样输出不再转义
+    answer_is_xml: bool = False
+
 
 class ResponseFormatter:
     """MCP 响应格式化器。
@@ -116,27 +121,29 @@ class ResponseFormatter:
                 session_id=data.session_id,
                 thought_steps=data.thought_steps,
                 partial_answer=data.answer,
+                answer_is_xml=data.answer_is_xml,
             )
 
         parts = ["<response>"]
 
         # 1. 思考过程（错误时在 _format_error 中输出）
         if data.thought_steps:
-            parts.append(self._format_thought_process(data.thought_steps))
+            self._extend_thought_process(parts, data.thought_steps)
 
         # 2. 最终答案
-        parts.append(self._format_answer(data.answer))
+        self._extend_answer(parts, data.answer, answer_is_xml=data.answer_is_xml)
 
         # 3. 会话 ID（用于继续对话，外部名称为 continuation_id）
         if data.session_id:
-            parts.append(f"  <continuation_id>{data.session_id}</continuation_id>")
+            parts.append(f"  <continuation_id>{escape_xml_text(data.session_id)}</continuation_id>")
 
         # 4. 调试信息（debug 时输出）
         if debug and data.debug_info:
-            parts.append(self._format_debug_info(data.debug_info))
+            self._extend_debug_info(parts, data.debug_info)
 
         parts.append("</response>")
 
+        # 各段直接追加到同一列表，仅在此处 join 一次
         return "\n".join(parts)
 
     def format_for_file(
@@ -156,15 +163,13 @@ class ResponseFormatter:
         if not data.success:
             return f"Error: {data.error or 'Unknown error'}"
 
-        parts = []
+        parts: list[str] = []
 
         # 1. 思考过程
         if data.thought_steps:
             parts.append("## Thought Process\n")
             for i, step in enumerate(data.thought_steps, 1):
-                parts.append(f"### Step {i}\n")
-                parts.append(step.strip())
-                parts.append("\n")
+                parts.extend((f"### Step {i}\n", step.strip(), "\n"))
 
         # 2. 最终答案
         if data.thought_steps:
@@ -173,26 +178,22 @@ class ResponseFormatter:
 
         return "\n".join(parts)
 
-    def _format_thought_process(self, steps: list[str]) -> str:
-        """格式化思考过程。"""
-        lines = ["  <thought_process>"]
+    def _extend_thought_process(self, lines: list[str], steps: Sequence[str]) -> None:
+        """追加思考过程行。"""
+        lines.append("  <thought_process>")
         for i, step in enumerate(steps, 1):
-            clean_text = step.strip()
-            lines.append(f'    <step index="{i}">')
-            lines.append(clean_text)
-            lines.append("    </step>")
+            lines.extend((f'    <step index="{i}">', escape_xml_text(step.strip()), "    </step>"))
         lines.append("  </thought_process>")
-        return "\n".join(lines)
 
-    def _format_answer(self, answer: str) -> str:
-        """格式化最终答案。"""
-        return f"  <answer>\n{answer}\n  </answer>"
+    def _extend_answer(self, lines: list[str], answer: str, *, answer_is_xml: bool = False) -> None:
+        """追加最终答案行（answer_is_xml 时原样输出）。"""
+        lines.extend(("  <answer>", answer if answer_is_xml else escape_xml_text(answer), "  </answer>"))
 
-    def _format_debug_info(self, debug_info: DebugInfo) -> str:
-        """格式化调试信息（XML 格式）。"""
-        lines = ["  <debug_info>"]
+    def _extend_debug_info(self, lines: list[str], debug_info: DebugInfo) -> None:
+        """追加调试信息行（XML 格式）。"""
+        lines.append("  <debug_info>")
         if debug_info.model:
-            lines.append(f"    <model>{debug_info.model}</model>")
+            lines.append(f"    <model>{escape_xml_text(debug_info.model)}</model>")
         lines.append(f"    <duration_sec>{debug_info.duration_sec:.3f}</duration_sec>")
         lines.append(f"    <message_count>{debug_info.message_count}</message_count>")
         lines.append(f"    <tool_call_count>{debug_info.tool_call_count}</tool_call_count>")
@@ -203,14 +204,13 @@ class ResponseFormatter:
         if debug_info.cancelled:
             lines.append("    <cancelled>true</cancelled>")
         if debug_info.log_file:
-            lines.append(f"    <log_file>{debug_info.log_file}</log_file>")
+            lines.append(f"    <log_file>{escape_xml_text(debug_info.log_file)}</log_file>")
         if debug_info.handoff_file:
-            lines.append(f"    <handoff_file>{debug_info.handoff_file}</handoff_file>")
+            lines.append(f"    <handoff_file>{escape_xml_text(debug_info.handoff_file)}</handoff_file>")
         if debug_info.handoff_file_written is not None:
             flag = "true" if debug_info.handoff_file_written else "false"
             lines.append(f"    <handoff_file_written>{flag}</handoff_file_written>")
         lines.append("  </debug_info>")
-        return "\n".join(lines)
 
     def _format_error(
         self,
@@ -219,8 +219,9 @@ class ResponseFormatter:
         debug: bool = False,
         debug_info: DebugInfo | None = None,
         session_id: str = "",
-        thought_steps: list[str] | None = None,
+        thought_steps: Sequence[str] | None = None,
         partial_answer: str = "",
+        answer_is_xml: bool = False,
     ) -> str:
         """格式化错误响应。
 
@@ -231,31 +232,32 @@ class ResponseFormatter:
             session_id: 会话 ID（用于继续对话）
             thought_steps: 已收集的思考步骤
             partial_answer: 已收集的部分答案
+            answer_is_xml: partial_answer 已是 XML，原样输出
 
         Returns:
             XML 格式的错误响应
         """
-        parts = ["<response>"]
-        parts.append(f"  <error>{error}</error>")
+        parts = ["<response>", f"  <error>{escape_xml_text(error)}</error>"]
 
         # 错误时也返回已收集的思考步骤（方便调试和继续）
         if thought_steps:
-            parts.append(self._format_thought_process(thought_steps))
+            self._extend_thought_process(parts, thought_steps)
 
         # 错误时也返回已收集的部分答案
         if partial_answer and partial_answer.strip():
-            parts.append(f"  <partial_answer>{partial_answer}</partial_answer>")
+            body = partial_answer if answer_is_xml else escape_xml_text(partial_answer)
+            parts.append(f"  <partial_answer>{body}</partial_answer>")
 
         # 错误时也返回 session_id（方便客户端发送"继续"）
         if session_id:
-            parts.append(f"  <continuation_id>{session_id}</continuation_id>")
+            parts.append(f"  <continuation_id>{escape_xml_text(session_id)}</continuation_id>")
             # 如果有部分输出，提示客户端可以继续
             if thought_steps or (partial_answer and partial_answer.strip()):
                 parts.append("  <hint>Task failed. Above is the output collected so far. You can send 'continue' with this continuation_id to retry.</hint>")
 
         # 错误情况下也输出 debug_info（如果开启 debug）
         if debug and debug_info:
-            parts.append(self._format_debug_info(debug_info))
+            self._extend_debug_info(parts, debug_info)
 
         parts.append("</response>")
         return "\n".join(parts)
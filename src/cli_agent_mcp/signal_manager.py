@@ -7,6 +7,7 @@
 支持的配置：
 - CAM_SIGINT_MODE: cancel | exit | cancel_then_exit
 - CAM_SIGINT_DOUBLE_TAP_WINDOW: 双击退出窗口时间
+- CAM_SIGINT_FORCE_EXIT_TIMEOUT: 强制退出兜底时间
 
 这是解决"取消请求导致整个进程退出"问题的核心模块。
 """
@@ -15,8 +16,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import signal
 import sys
+import threading
 import time
 from typing import Callable, Optional
 
@@ -27,6 +30,18 @@ __all__ = ["SignalManager", "SigintMode"]
 
 logger = logging.getLogger(__name__)
 
+# 连续 SIGINT 合并窗口（纳秒）：窗口内且注册表未增长时不再重复 cancel_all()
+_SIGINT_COALESCE_NS = 50_000_000
+
+
+def _noop_shutdown() -> None:
+    """未提供 on_shutdown 时使用的空回调。"""
+
+
+def _call_now(callback: Callable[[], object]) -> None:
+    """在当前线程直接执行回调（已处于事件循环线程时使用）。"""
+    callback()
+
 
 class SignalManager:
     """信号管理器。
@@ -55,14 +70,21 @@ class SignalManager:
         registry: 请求注册表
         sigint_mode: SIGINT 处理模式
         double_tap_window: 双击退出窗口时间（秒）
+        force_exit_timeout: 强制退出兜底时间（秒）
     """
 
+    # _sig_state 状态位
+    _ST_REQ = 1
+    _ST_FORCE = 2
+    _ST_DONE = 4  # 关闭流程（回调 + 唤醒）已执行
+
     def __init__(
         self,
         registry: RequestRegistry,
         sigint_mode: Optional[SigintMode] = None,
         double_tap_window: Optional[float] = None,
         on_shutdown: Optional[Callable[[], None]] = None,
+        force_exit_timeout: Optional[float] = None,
     ) -> None:
         """初始化信号管理器。
 
@@ -71,6 +93,7 @@ class SignalManager:
             sigint_mode: SIGINT 处理模式（默认从配置读取）
             double_tap_window: 双击退出窗口时间（默认从配置读取）
             on_shutdown: 关闭时的回调函数
+            force_exit_timeout: 强制退出兜底时间（默认从配置读取）
         """
         self.registry = registry
 
@@ -80,27 +103,61 @@ class SignalManager:
         self.double_tap_window = (
             double_tap_window if double_tap_window is not None else config.sigint_double_tap_window
         )
-        self._on_shutdown = on_shutdown
+        self.force_exit_timeout = (
+            force_exit_timeout
+            if force_exit_timeout is not None
+            else config.sigint_force_exit_timeout
+        )
+        self._on_shutdown: Callable[[], None] = (
+            on_shutdown if on_shutdown is not None else _noop_shutdown
+        )
+        # 双击窗口预换算为纳秒，信号路径上只做整数比较
+        self._double_tap_window_ns = int(self.double_tap_window * 1_000_000_000)
+
+        # SIGINT 模式 -> 处理函数，避免每次信号做枚举比较。
+        # 枚举成员是单例，用 is 比较即可，无需经过 Enum.__hash__ 查表
+        mode = self.sigint_mode
+        self._sigint_impl: Callable[[], None]
+        if mode is SigintMode.EXIT:
+            self._sigint_impl = self._sigint_exit
+        elif mode is SigintMode.CANCEL_THEN_EXIT:
+            self._sigint_impl = self._sigint_cancel_then_exit
+        else:
+            # CANCEL（与 SigintMode.from_string 的默认值一致）
+            self._sigint_impl = self._sigint_cancel
 
         # 内部状态
-        self._last_sigint_time: float = 0.0
-        self._shutdown_requested: bool = False
-        self._force_exit: bool = False  # 双击 SIGINT 触发的强制退出标志
-        self._shutdown_event: Optional[asyncio.Event] = None
+        self._last_sigint_time: int = 0  # time.monotonic_ns()，不受系统时钟跳变影响
+        # 关闭状态位：_ST_REQ=已请求关闭，_ST_FORCE=双击 SIGINT 触发的强制退出，
+        # _ST_DONE=关闭流程已执行（保证回调与唤醒只做一次）
+        self._sig_state: int = 0
+        # 最近一次 SIGINT 触发 cancel_all() 的时间及当时的注册表大小
+        self._last_cancel_time_ns: int = -_SIGINT_COALESCE_NS
+        self._last_cancel_size: int = 0
+        # 关闭信号：只会被完成一次的 Future（比 asyncio.Event 少一层等待者管理）
+        self._shutdown_event: Optional[asyncio.Future[None]] = None
+        # 仅 Windows 分支使用（POSIX 由 loop.remove_signal_handler 恢复）
         self._original_sigint_handler: Optional[signal.Handlers] = None
-        self._original_sigterm_handler: Optional[signal.Handlers] = None
         self._running: bool = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 强制退出兜底定时器（清理完成后由 cancel_force_exit_backstop() 取消）
+        self._force_exit_timer: Optional[threading.Timer] = None
+        # 信号处理回调使用的唤醒函数（start() 中设置）：
+        # POSIX 上 add_signal_handler 回调、Windows 上经 call_soon_threadsafe 转发的
+        # SIGINT 处理都在循环线程执行，
+        # 直接完成 Future 即可，无需再排一个回调；
+        # 其他线程的关闭请求（request_graceful_shutdown）仍走 call_soon_threadsafe
+        self._wake: Optional[Callable[..., object]] = None
 
     @property
     def is_shutdown_requested(self) -> bool:
         """是否已请求关闭。"""
-        return self._shutdown_requested
+        return bool(self._sig_state & self._ST_REQ)
 
     @property
     def is_force_exit(self) -> bool:
         """是否请求强制退出（双击 SIGINT）。"""
-        return self._force_exit
+        return bool(self._sig_state & self._ST_FORCE)
 
     async def start(self) -> None:
         """启动信号监听。
@@ -113,16 +170,20 @@ class SignalManager:
             return
 
         self._loop = asyncio.get_running_loop()
-        self._shutdown_event = asyncio.Event()
+        self._shutdown_event = self._loop.create_future()
+        # start() 之前已请求关闭（此时尚无循环可唤醒）：直接补上完成状态
+        if self._sig_state & self._ST_DONE:
+            self._shutdown_event.set_result(None)
         self._running = True
+        self._wake = _call_now
 
         # 在 POSIX 系统上设置信号处理器
         if sys.platform != "win32":
-            # 保存原始处理器
-            self._original_sigint_handler = signal.getsignal(signal.SIGINT)
-            self._original_sigterm_handler = signal.getsignal(signal.SIGTERM)
-
+            # stop() 通过 remove_signal_handler 恢复默认处理，无需保存原始处理器
             # 设置新处理器（使用 loop.add_signal_handler）
+            # add_signal_handler 内部已通过 signal.set_wakeup_fd 写事件循环的
+            # self-pipe，C 级信号处理只写一个字节，回调在循环线程上执行；
+            # 不要另装 wakeup fd（进程内只能有一个，会覆盖 asyncio 的）
             self._loop.add_signal_handler(
                 signal.SIGINT,
                 self._handle_sigint,
@@ -136,10 +197,12 @@ class SignalManager:
                 f"double_tap_window={self.double_tap_window}s)"
             )
         else:
-            # Windows: 使用 signal.signal() 设置处理器
+            # Windows: 没有 add_signal_handler，signal.signal() 处理器把
+            # SIGINT 状态机转发到事件循环线程执行
+            loop = self._loop
             self._original_sigint_handler = signal.signal(
                 signal.SIGINT,
-                lambda sig, frame: self._handle_sigint(),
+                lambda sig, frame: loop.call_soon_threadsafe(self._handle_sigint),
             )
             logger.debug(
                 f"SIGINT handler installed on Windows (mode={self.sigint_mode.value})"
@@ -175,8 +238,8 @@ class SignalManager:
 
         在收到 SIGTERM 或满足退出条件的 SIGINT 后返回。
         """
-        if self._shutdown_event:
-            await self._shutdown_event.wait()
+        if self._shutdown_event is not None:
+            await self._shutdown_event
 
     def _handle_sigint(self) -> None:
         """处理 SIGINT 信号。
@@ -186,50 +249,75 @@ class SignalManager:
         - 如果没有活动请求或模式为 EXIT：请求关闭
         - 如果在双击窗口内再次收到 SIGINT：强制退出
         """
-        current_time = time.time()
-        time_since_last = current_time - self._last_sigint_time
-        self._last_sigint_time = current_time
+        # 时间戳每次都要记录：首次按键的时间是双击判断和合并窗口的基准
+        now = time.monotonic_ns()
+        last = self._last_sigint_time
+        self._last_sigint_time = now
 
-        # 检查双击退出
-        if time_since_last < self.double_tap_window and self._shutdown_requested:
+        # 检查双击退出（未请求关闭时不必计算间隔）
+        if self._sig_state & self._ST_REQ and now - last < self._double_tap_window_ns:
             logger.warning("Double SIGINT detected, forcing shutdown")
             self._force_shutdown()
             return
 
-        # 根据模式处理
-        if self.sigint_mode == SigintMode.EXIT:
-            # 直接退出模式
-            logger.info("SIGINT received (mode=exit), requesting shutdown")
+        # 按模式分发（处理函数在初始化时选定）
+        self._sigint_impl()
+
+    def _cancel_coalesced(self) -> Optional[int]:
+        """SIGINT 路径上的 cancel_all()，合并窗口内的重复信号。
+
+        Returns:
+            取消的请求数；被合并跳过时返回 None
+        """
+        now = self._last_sigint_time
+        size = len(self.registry)
+        if (
+            now - self._last_cancel_time_ns < _SIGINT_COALESCE_NS
+            and size <= self._last_cancel_size
+        ):
+            return None
+        self._last_cancel_time_ns = now
+        self._last_cancel_size = size
+        return self.registry.cancel_all()
+
+    def _sigint_exit(self) -> None:
+        """EXIT 模式：直接请求关闭。"""
+        logger.info("SIGINT received (mode=exit), requesting shutdown")
+        self._request_shutdown()
+
+    def _sigint_cancel(self) -> None:
+        """CANCEL 模式：有活动请求则取消，否则退出。"""
+        # cancel_all() 无活动请求时返回 0，只遍历一次注册表
+        count = self._cancel_coalesced()
+        if count is None:
+            logger.debug("SIGINT coalesced (mode=cancel)")
+        elif count:
+            logger.info("SIGINT received (mode=cancel), cancelled %d request(s)", count)
+        else:
+            logger.info(
+                "SIGINT received (mode=cancel), no active requests, requesting shutdown"
+            )
             self._request_shutdown()
 
-        elif self.sigint_mode == SigintMode.CANCEL:
-            # 取消模式：有活动请求则取消，否则退出
-            if self.registry.has_active_requests():
-                count = self.registry.cancel_all()
-                logger.info(
-                    f"SIGINT received (mode=cancel), cancelled {count} request(s)"
-                )
-            else:
-                logger.info(
-                    "SIGINT received (mode=cancel), no active requests, requesting shutdown"
-                )
-                self._request_shutdown()
-
-        elif self.sigint_mode == SigintMode.CANCEL_THEN_EXIT:
-            # 先取消后退出模式
-            if self.registry.has_active_requests():
-                count = self.registry.cancel_all()
-                logger.info(
-                    f"SIGINT received (mode=cancel_then_exit), cancelled {count} request(s). "
-                    f"Press Ctrl+C again within {self.double_tap_window}s to exit."
-                )
-                # 标记为已请求关闭，但不触发实际关闭
-                self._shutdown_requested = True
-            else:
-                logger.info(
-                    "SIGINT received (mode=cancel_then_exit), no active requests, requesting shutdown"
-                )
-                self._request_shutdown()
+    def _sigint_cancel_then_exit(self) -> None:
+        """CANCEL_THEN_EXIT 模式：先取消，双击窗口内再次 SIGINT 则退出。"""
+        count = self._cancel_coalesced()
+        if count is None:
+            logger.debug("SIGINT coalesced (mode=cancel_then_exit)")
+        elif count:
+            logger.info(
+                "SIGINT received (mode=cancel_then_exit), cancelled %d request(s). "
+                "Press Ctrl+C again within %ss to exit.",
+                count,
+                self.double_tap_window,
+            )
+            # 标记为已请求关闭，但不触发实际关闭
+            self._sig_state |= self._ST_REQ
+        else:
+            logger.info(
+                "SIGINT received (mode=cancel_then_exit), no active requests, requesting shutdown"
+            )
+            self._request_shutdown()
 
     def _handle_sigterm(self) -> None:
         """处理 SIGTERM 信号。
@@ -239,63 +327,115 @@ class SignalManager:
         logger.info("SIGTERM received, initiating graceful shutdown")
 
         # 取消所有活动请求
-        if self.registry.has_active_requests():
-            count = self.registry.cancel_all()
-            logger.info(f"Cancelled {count} active request(s) for shutdown")
+        count = self.registry.cancel_all()
+        if count:
+            logger.info("Cancelled %d active request(s) for shutdown", count)
 
         self._request_shutdown()
 
-    def _request_shutdown(self) -> None:
-        """请求关闭。"""
-        self._shutdown_requested = True
+    def _request_shutdown(self, wake: Optional[Callable[..., object]] = None) -> None:
+        """请求关闭（幂等，重复调用直接返回）。
 
-        # 调用关闭回调
-        if self._on_shutdown:
-            try:
-                self._on_shutdown()
-            except Exception as e:
-                logger.warning(f"Error in shutdown callback: {e}")
+        Args:
+            wake: 唤醒事件循环的调度函数；默认使用 self._wake
+                （仅适用于已在事件循环线程上的信号处理回调）
+        """
+        if self._sig_state & self._ST_DONE:
+            return
+        self._sig_state |= self._ST_REQ | self._ST_DONE
+
+        # 调用关闭回调（未配置时为空函数）
+        try:
+            self._on_shutdown()
+        except Exception as e:
+            logger.warning("Error in shutdown callback: %s", e)
 
         # 设置关闭事件
-        if self._shutdown_event and self._loop:
-            self._loop.call_soon_threadsafe(self._shutdown_event.set)
+        if wake is None:
+            wake = self._wake
+        if wake is not None:
+            wake(self._resolve_shutdown)
+
+    def _resolve_shutdown(self) -> None:
+        """在事件循环线程上完成关闭 Future（重复调用无副作用）。"""
+        future = self._shutdown_event
+        if future is not None and not future.done():
+            future.set_result(None)
 
     def _force_shutdown(self) -> None:
         """强制退出。
 
         设置 force_exit 标志并触发 shutdown event。
-        实际的进程退出由 run_server() 在清理完成后执行。
+        实际的进程退出由 run_server() 在清理完成后执行；
+        若清理阻塞超过 force_exit_timeout，兜底定时器直接 os._exit(130)。
+        第三次及以后的 Ctrl+C 直接返回，不重复取消、回调和唤醒。
         """
+        if self._sig_state & self._ST_FORCE:
+            return
         logger.warning("Forcing immediate shutdown")
-        self._force_exit = True
-        self._shutdown_requested = True
+        self._sig_state |= self._ST_REQ | self._ST_FORCE | self._ST_DONE
 
         # 取消所有活动请求
-        if self.registry.has_active_requests():
-            count = self.registry.cancel_all()
-            logger.info(f"Force shutdown: cancelled {count} request(s)")
+        count = self.registry.cancel_all()
+        if count:
+            logger.info("Force shutdown: cancelled %d request(s)", count)
 
-        # 调用关闭回调
-        if self._on_shutdown:
-            try:
-                self._on_shutdown()
-            except Exception as e:
-                logger.warning(f"Error in shutdown callback: {e}")
+        # 调用关闭回调（未配置时为空函数）
+        try:
+            self._on_shutdown()
+        except Exception as e:
+            logger.warning("Error in shutdown callback: %s", e)
 
         # 设置 shutdown event（让主循环有机会清理后退出）
-        if self._shutdown_event and self._loop:
-            self._loop.call_soon_threadsafe(self._shutdown_event.set)
+        wake = self._wake
+        if wake is not None:
+            wake(self._resolve_shutdown)
+
+        self._arm_force_exit_backstop()
+
+    def _arm_force_exit_backstop(self) -> None:
+        """启动强制退出兜底定时器。
+
+        使用守护线程而非 loop.call_later：清理卡死时事件循环本身可能已被阻塞，
+        依赖它的定时器永远不会触发。守护线程不会阻止进程正常退出。
+        """
+        timer = threading.Timer(self.force_exit_timeout, self._force_exit_now)
+        timer.daemon = True
+        self._force_exit_timer = timer
+        timer.start()
+
+    def cancel_force_exit_backstop(self) -> None:
+        """清理已完成：取消强制退出兜底定时器。
+
+        须在清理结束、进程正常退出（atexit、日志刷新等）之前调用，
+        避免定时器在这些收尾工作期间触发 os._exit 丢失写入。
+        """
+        timer = self._force_exit_timer
+        if timer is not None:
+            self._force_exit_timer = None
+            timer.cancel()
+
+    def _force_exit_now(self) -> None:
+        """兜底定时器到期：清理仍未完成，直接结束进程。"""
+        logger.critical(
+            "Cleanup did not finish within %ss after forced shutdown, "
+            "terminating with exit code 130",
+            self.force_exit_timeout,
+        )
+        os._exit(130)  # 128 + SIGINT(2) = 130
 
     def request_graceful_shutdown(self) -> None:
         """程序化请求优雅退出。
 
-        可以从代码中调用以触发关闭流程。
+        可以从代码中调用以触发关闭流程（线程安全）。
         """
         logger.info("Programmatic shutdown requested")
 
         # 取消所有活动请求
-        if self.registry.has_active_requests():
-            count = self.registry.cancel_all()
-            logger.info(f"Cancelled {count} active request(s)")
+        count = self.registry.cancel_all()
+        if count:
+            logger.info("Cancelled %d active request(s)", count)
 
-        self._request_shutdown()
+        # 调用方可能不在事件循环线程上，经 call_soon_threadsafe 完成关闭 Future
+        loop = self._loop
+        self._request_shutdown(loop.call_soon_threadsafe if loop is not None else None)
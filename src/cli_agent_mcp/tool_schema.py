@@ -1,16 +1,22 @@
 """Tool Schema 定义。
 
 包含工具描述、参数 schema 和 schema 创建函数。
+
+SUPPORTED_TOOLS / PARALLEL_SUPPORTED_TOOLS 为 frozenset，预构建的 schema 表
+依赖其不可变；*_PROPERTIES 与 create_tool_schema 的返回值按只读约定共享。
 """
 
 from __future__ import annotations
 
 from typing import Any
 
+from ._tool_descriptions import TOOL_DESCRIPTIONS
+
 __all__ = [
     "SUPPORTED_TOOLS",
     "PARALLEL_SUPPORTED_TOOLS",
     "TOOL_DESCRIPTIONS",
+    "get_tool_description",
     "COMMON_PROPERTIES",
     "CODEX_PROPERTIES",
     "CLAUDE_PROPERTIES",
@@ -24,148 +30,18 @@ __all__ = [
 ]
 
 # 支持的工具列表（用于校验）
-SUPPORTED_TOOLS = {"codex", "gemini", "claude", "opencode", "banana", "image"}
-
-# 支持 parallel 的 CLI 工具
-PARALLEL_SUPPORTED_TOOLS = ["codex", "gemini", "claude", "opencode"]
+SUPPORTED_TOOLS = frozenset({"codex", "gemini", "claude", "opencode", "banana", "image"})
 
-# 工具描述
-TOOL_DESCRIPTIONS = {
-    "codex": """Run OpenAI Codex CLI agent (deep analysis / critical review).
-
-NO SHARED MEMORY:
-- Cannot see messages/outputs from gemini/claude/opencode.
-- Only receives: (1) this prompt, (2) a list of reference paths from context_paths (not file contents), (3) its own history via continuation_id.
-- Can read files from the workspace during execution (subject to permission).
-
-CROSS-AGENT HANDOFF:
-- Small data: paste into prompt.
-- Step 1 (write): provide handoff_file so this tool appends its output as <agent-output ...>.
-- Step 2 (read): in a later call, pass that file via context_paths and explicitly instruct the agent what to read.
-- The handoff file contains multiple <agent-output ...> blocks; when it grows, read only the last N blocks or filter by task_note/task_index.
-
-CAPABILITIES:
-- Strongest deep analysis and reflection abilities
-- Excellent at finding issues, edge cases, and potential bugs
-- Good at critical code review and architectural assessment
+# 支持 parallel 的 CLI 工具（frozenset：O(1) 成员判断；无调用方依赖顺序）
+PARALLEL_SUPPORTED_TOOLS = frozenset({"codex", "gemini", "claude", "opencode"})
 
-BEST PRACTICES:
-- Be explicit about scope: "Only fix X, don't refactor Y"
-- Specify constraints: "Keep it simple, no new abstractions"
-
-Supports: image attachments.""",
+# parallel 模式下从公共参数中排除的字段
+_PARALLEL_EXCLUDED_COMMON = frozenset({"prompt", "continuation_id", "model"})
 
-    "gemini": """Run Google Gemini CLI agent (UI design / comprehensive analysis).
-
-NO SHARED MEMORY:
-- Cannot see messages/outputs from codex/claude/opencode.
-- Only receives: (1) this prompt, (2) a list of reference paths from context_paths (not file contents), (3) its own history via continuation_id.
-- Can read files from the workspace during execution (subject to permission).
-
-CROSS-AGENT HANDOFF:
-- Small data: paste into prompt.
-- Step 1 (write): provide handoff_file so this tool appends its output as <agent-output ...>.
-- Step 2 (read): in a later call, pass that file via context_paths and explicitly instruct the agent what to read.
-- The handoff file contains multiple <agent-output ...> blocks; when it grows, read only the last N blocks or filter by task_note/task_index.
-
-CAPABILITIES:
-- Strongest UI design and image understanding abilities
-- Excellent at rapid UI prototyping and visual tasks
-- Great at inferring original requirements from code clues
-- Best for full-text analysis and detective work
-
-BEST PRACTICES:
-- Good first choice for "understand this codebase" tasks""",
-
-    "claude": """Run Anthropic Claude CLI agent (code implementation).
-
-NO SHARED MEMORY:
-- Cannot see messages/outputs from codex/gemini/opencode.
-- Only receives: (1) this prompt, (2) a list of reference paths from context_paths (not file contents), (3) its own history via continuation_id.
-- Can read files from the workspace during execution (subject to permission).
-
-CROSS-AGENT HANDOFF:
-- Small data: paste into prompt.
-- Step 1 (write): provide handoff_file so this tool appends its output as <agent-output ...>.
-- Step 2 (read): in a later call, pass that file via context_paths and explicitly instruct the agent what to read.
-- The handoff file contains multiple <agent-output ...> blocks; when it grows, read only the last N blocks or filter by task_note/task_index.
-
-CAPABILITIES:
-- Strongest code writing and implementation abilities
-- Excellent at translating requirements into working code
-- Good at following patterns and conventions
-
-BEST PRACTICES:
-- Be explicit about target: "Replace old implementation completely"
-- Specify cleanup: "Remove deprecated code paths"
-
-Supports: system_prompt, append_system_prompt, agent parameter.""",
-
-    "opencode": """Run OpenCode CLI agent (full-stack development).
-
-NO SHARED MEMORY:
-- Cannot see messages/outputs from codex/gemini/claude.
-- Only receives: (1) this prompt, (2) a list of reference paths from context_paths (not file contents), (3) its own history via continuation_id.
-- Can read files from the workspace during execution (subject to permission).
-
-CROSS-AGENT HANDOFF:
-- Small data: paste into prompt.
-- Step 1 (write): provide handoff_file so this tool appends its output as <agent-output ...>.
-- Step 2 (read): in a later call, pass that file via context_paths and explicitly instruct the agent what to read.
-- The handoff file contains multiple <agent-output ...> blocks; when it grows, read only the last N blocks or filter by task_note/task_index.
-
-CAPABILITIES:
-- Excellent at rapid prototyping and development tasks
-- Good at working with multiple frameworks and tools
-- Supports multiple AI providers (Anthropic, OpenAI, Google, etc.)
-
-BEST PRACTICES:
-- Specify agent type for specialized tasks (e.g., --agent build)
-- Use file attachments for context-heavy tasks
-
-Supports: file attachments, multiple agents (build, plan, etc.).""",
-
-    "banana": """Generate images using Nano Banana Pro (Gemini 3 Pro Image).
-
-CAPABILITIES:
-- Text-to-image generation with high quality output
-- Image editing and transformation with reference images
-- Multiple aspect ratios and resolutions (1K/2K/4K)
-- Style transfer and multi-image fusion
-- Optional search grounding for factual content
-
-RESPONSE FORMAT:
-- Returns XML with file paths to generated images
-- Images are saved to disk (no base64 in response)
-- Includes text descriptions and optional thinking process
-
-BEST PRACTICES:
-- Be descriptive: describe scenes, not just keywords
-- Use negative constraints in prompt: "no text", "no watermark"
-- For editing: provide reference image and specify what to keep
-- For style transfer: provide style reference image
-
-Supports: reference images with roles (edit_base, style_ref, etc.).""",
-
-    "image": """Generate images via OpenRouter-compatible or OpenAI-compatible endpoints.
-
-CAPABILITIES:
-- Text-to-image generation with multiple providers
-- Image editing and transformation with reference images
-- Multiple aspect ratios and resolutions (1K/2K/4K)
-
-RESPONSE FORMAT:
-- Returns XML with file paths to generated images
-- Images saved to disk (no base64 in response)
-- Includes text descriptions when available
-
-BEST PRACTICES:
-- Be descriptive: describe scenes, lighting, style, composition
-- Use negative constraints in prompt: "no text", "no watermark", "no blur"
-- For editing: provide reference image and specify what to keep
-
-Supports: reference images for editing.""",
-}
+# 以下 *_PROPERTIES 均按只读约定使用：预计算的 schema 表直接引用其中的
+# 子 schema dict（不复制），修改它们会影响所有工具的 schema。
+# 不使用 MappingProxyType：fastmcp 经 pydantic_core 序列化 schema，
+# 二者都无法序列化 mappingproxy。
 
 # 公共参数 schema（按重要性排序）
 COMMON_PROPERTIES = {
@@ -281,6 +157,9 @@ COMMON_PROPERTIES = {
     },
 }
 
+# 路径列表参数描述的公共前缀
+_PATH_DESC_PREFIX = "Absolute paths OR workspace-relative paths to "
+
 # 特有参数（插入到公共参数之后）
 CODEX_PROPERTIES = {
     "image": {
@@ -288,7 +167,8 @@ CODEX_PROPERTIES = {
         "items": {"type": "string"},
         "default": [],
         "description": (
-            "Absolute paths OR workspace-relative paths to image files for visual context. "
+            _PATH_DESC_PREFIX
+            + "image files for visual context. "
             "Use for: UI screenshots, error dialogs, design mockups. "
             "Example: ['/path/to/screenshot.png']"
         ),
@@ -330,7 +210,8 @@ OPENCODE_PROPERTIES = {
         "items": {"type": "string"},
         "default": [],
         "description": (
-            "Absolute paths OR workspace-relative paths to files to attach to the message. "
+            _PATH_DESC_PREFIX
+            + "files to attach to the message. "
             "Use for: Source code files, configuration files, documentation. "
             "Example: ['/path/to/main.py', '/path/to/config.json']"
         ),
@@ -560,16 +441,152 @@ PARALLEL_PROPERTIES = {
 }
 
 
+# 各类工具的必填参数（构建 schema 表时转换为 list，JSON Schema 要求数组）
+_REQUIRED_CLI = ("prompt", "workspace", "handoff_file")
+_REQUIRED_CLI_PARALLEL = ("workspace", "handoff_file", "parallel_prompts", "parallel_task_notes")
+_REQUIRED_IMAGE_TOOL = ("prompt", "save_path", "task_note")
+
+# 图片工具的 task_note：输出文件前缀 / 子目录名（banana / image 共用）
+_IMAGE_TASK_NOTE_PROPERTY: dict[str, Any] = {
+    "type": "string",
+    "description": (
+        "Output file prefix / subdirectory name (English recommended, e.g., 'hero-banner', 'product-shot'). "
+        "Used to organize files under save_path (e.g., {save_path}/{task_note}/...). "
+        "Must be a safe name: no '/', '\\\\', '..', or path separators. "
+        "Also shown in GUI."
+    ),
+}
+
+# Banana 工具使用简化的 schema（不支持 parallel），导入时构建一次
+_BANANA_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "prompt": {
+            "type": "string",
+            "description": (
+                "Image generation prompt. Structure: "
+                "<goal>what you want to generate (can be a statement)</goal> "
+                "<context>detailed background info - the more the better</context> "
+                "<hope>desired visual outcome, can be abstract</hope>. "
+                "Example: <goal>Generate 6 weather icons for a mobile app</goal> "
+                "<context>Target users are young professionals, app has a friendly casual vibe, needs to match existing UI with rounded corners</context> "
+                "<hope>pastel colors, consistent 3px stroke, 64x64 base size</hope>"
+            ),
+        },
+        **BANANA_PROPERTIES,
+        "task_note": _IMAGE_TASK_NOTE_PROPERTY,
+        "debug": TAIL_PROPERTIES["debug"],
+    },
+    "required": list(_REQUIRED_IMAGE_TOOL),
+}
+
+# Image 工具使用简化的 schema（不支持 parallel），导入时构建一次
+_IMAGE_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "prompt": {
+            "type": "string",
+            "description": (
+                "Image generation prompt. Structure: "
+                "<goal>what you want to generate (can be a statement)</goal> "
+                "<context>detailed background info - the more the better</context> "
+                "<hope>desired visual outcome, can be abstract</hope>. "
+                "Example: <goal>Create a 4-panel comic about debugging</goal> "
+                "<context>Developer finds a bug at 3am, tries multiple fixes, finally discovers it was a typo, comedic relief for tech blog</context> "
+                "<hope>simple black-white line art, speech bubbles, exaggerated tired expressions</hope>"
+            ),
+        },
+        **IMAGE_PROPERTIES,
+        "task_note": _IMAGE_TASK_NOTE_PROPERTY,
+        "debug": TAIL_PROPERTIES["debug"],
+    },
+    "required": list(_REQUIRED_IMAGE_TOOL),
+}
+
+# parallel 模式下的公共参数变体（导入时构建一次）
+_CONTEXT_PATHS_PARALLEL: dict[str, Any] = {
+    **COMMON_PROPERTIES["context_paths"],
+    "description": (
+        COMMON_PROPERTIES["context_paths"]["description"]
+        + " In parallel mode, this list is shared by all tasks."
+    ),
+}
+
+_PERMISSION_PARALLEL: dict[str, Any] = {
+    **COMMON_PROPERTIES["permission"],
+    "description": (
+        COMMON_PROPERTIES["permission"]["description"]
+        + "\nPARALLEL NOTE: For each parallel_continuation_ids[i], permission is still locked to that session. "
+        "If you need to change permission for a resumed task, start a new session for that task "
+        "(use empty string in parallel_continuation_ids[i])."
+    ),
+}
+
+_PARALLEL_COMMON_OVERRIDES: dict[str, dict[str, Any]] = {
+    "context_paths": _CONTEXT_PATHS_PARALLEL,
+    "permission": _PERMISSION_PARALLEL,
+}
+
+_MODEL_PARALLEL: dict[str, Any] = {
+    "type": "array",
+    "items": {"type": "string"},
+    "default": [],
+    "description": (
+        "Model override(s). If single element, all tasks use that model. "
+        "If multiple elements, must match parallel_prompts length - each task uses corresponding model. "
+        "Empty array uses CLI default."
+    ),
+}
+
+# parallel 模式的公共参数：排除 prompt / continuation_id / model，
+# 替换 parallel 变体，并把 model 改为数组类型（位于公共参数末尾）
+_PARALLEL_COMMON_PROPERTIES: dict[str, Any] = {
+    **{
+        key: _PARALLEL_COMMON_OVERRIDES.get(key, value)
+        for key, value in COMMON_PROPERTIES.items()
+        if key not in _PARALLEL_EXCLUDED_COMMON
+    },
+    "model": _MODEL_PARALLEL,
+}
+
+# 各 CLI 工具的特有参数（插入到公共参数之后）
+_SPECIFIC_PROPERTIES: dict[str, dict[str, Any]] = {
+    "codex": CODEX_PROPERTIES,
+    "claude": CLAUDE_PROPERTIES,
+    "opencode": OPENCODE_PROPERTIES,
+}
+
+
+def get_tool_description(name: str) -> str:
+    """返回工具描述，未知工具返回空字符串。"""
+    return TOOL_DESCRIPTIONS.get(name, "")
+
+
+_PARALLEL_SUFFIX = "_parallel"
+_PARALLEL_SUFFIX_LEN = len(_PARALLEL_SUFFIX)
+
+# 已知工具名 -> (base_name, is_parallel)
+_NAME_TABLE: dict[str, tuple[str, bool]] = {
+    **{tool: (tool, False) for tool in SUPPORTED_TOOLS},
+    **{tool + _PARALLEL_SUFFIX: (tool, True) for tool in SUPPORTED_TOOLS},
+}
+
+
 def normalize_tool_name(name: str) -> tuple[str, bool]:
     """返回 (base_name, is_parallel)"""
-    if name.endswith("_parallel"):
-        return name.removesuffix("_parallel"), True
+    hit = _NAME_TABLE.get(name)
+    if hit is not None:
+        return hit
+    if name[-_PARALLEL_SUFFIX_LEN:] == _PARALLEL_SUFFIX:
+        return name[:-_PARALLEL_SUFFIX_LEN], True
     return name, False
 
 
 def create_tool_schema(cli_type: str, is_parallel: bool = False) -> dict[str, Any]:
     """创建工具的 JSON Schema。
 
+    已知工具返回导入时预构建的共享 schema（调用方不得修改），未知工具即时构建。
+
     参数顺序：
     1. prompt, workspace, handoff_file (必填)
     2. continuation_id, permission, model (常用)
@@ -577,139 +594,49 @@ def create_tool_schema(cli_type: str, is_parallel: bool = False) -> dict[str, An
     4. parallel 参数 (仅 parallel 模式)
     5. task_note, debug (末尾)
     """
-    # Banana 工具使用简化的 schema（不支持 parallel）
-    if cli_type == "banana":
-        properties: dict[str, Any] = {
-            "prompt": {
-                "type": "string",
-                "description": (
-                    "Image generation prompt. Structure: "
-                    "<goal>what you want to generate (can be a statement)</goal> "
-                    "<context>detailed background info - the more the better</context> "
-                    "<hope>desired visual outcome, can be abstract</hope>. "
-                    "Example: <goal>Generate 6 weather icons for a mobile app</goal> "
-                    "<context>Target users are young professionals, app has a friendly casual vibe, needs to match existing UI with rounded corners</context> "
-                    "<hope>pastel colors, consistent 3px stroke, 64x64 base size</hope>"
-                ),
-            },
-        }
-        properties.update(BANANA_PROPERTIES)
-        properties["task_note"] = {
-            "type": "string",
-            "description": (
-                "Output file prefix / subdirectory name (English recommended, e.g., 'hero-banner', 'product-shot'). "
-                "Used to organize files under save_path (e.g., {save_path}/{task_note}/...). "
-                "Must be a safe name: no '/', '\\\\', '..', or path separators. "
-                "Also shown in GUI."
-            ),
-        }
-        properties["debug"] = TAIL_PROPERTIES["debug"]
-        return {
-            "type": "object",
-            "properties": properties,
-            "required": ["prompt", "save_path", "task_note"],
-        }
-
-    # Image 工具使用简化的 schema（不支持 parallel）
-    if cli_type == "image":
-        properties: dict[str, Any] = {
-            "prompt": {
-                "type": "string",
-                "description": (
-                    "Image generation prompt. Structure: "
-                    "<goal>what you want to generate (can be a statement)</goal> "
-                    "<context>detailed background info - the more the better</context> "
-                    "<hope>desired visual outcome, can be abstract</hope>. "
-                    "Example: <goal>Create a 4-panel comic about debugging</goal> "
-                    "<context>Developer finds a bug at 3am, tries multiple fixes, finally discovers it was a typo, comedic relief for tech blog</context> "
-                    "<hope>simple black-white line art, speech bubbles, exaggerated tired expressions</hope>"
-                ),
-            },
-        }
-        properties.update(IMAGE_PROPERTIES)
-        properties["task_note"] = {
-            "type": "string",
-            "description": (
-                "Output file prefix / subdirectory name (English recommended, e.g., 'hero-banner', 'product-shot'). "
-                "Used to organize files under save_path (e.g., {save_path}/{task_note}/...). "
-                "Must be a safe name: no '/', '\\\\', '..', or path separators. "
-                "Also shown in GUI."
-            ),
-        }
-        properties["debug"] = TAIL_PROPERTIES["debug"]
-        return {
-            "type": "object",
-            "properties": properties,
-            "required": ["prompt", "save_path", "task_note"],
-        }
-
-    # 按顺序构建 properties
-    properties = {}
-
-    # 1. 公共参数（必填 + 常用）
-    # parallel 模式下排除 prompt, continuation_id, model
+    is_parallel = bool(is_parallel)
+    schema = _SCHEMA_TABLE.get((cli_type, is_parallel))
+    if schema is None:
+        schema = _build_cli_schema(cli_type, is_parallel)
+    return schema
+
+
+def _build_cli_schema(cli_type: str, is_parallel: bool) -> dict[str, Any]:
+    """按参数顺序合并 CLI 工具的 properties 并构建 schema。"""
+    # 按顺序合并 properties（单个 dict 字面量，等价于依次 update）：
+    # 1. 公共参数  2. 特有参数  3. parallel 参数  4. 末尾参数
+    specific = _SPECIFIC_PROPERTIES.get(cli_type, {})
     if is_parallel:
-        for key, value in COMMON_PROPERTIES.items():
-            if key in ("prompt", "continuation_id", "model"):
-                continue
-            if key == "context_paths":
-                shared = dict(value)
-                shared["description"] = (
-                    f"{value.get('description', '')} "
-                    "In parallel mode, this list is shared by all tasks."
-                ).strip()
-                properties[key] = shared
-            elif key == "permission":
-                perm = dict(value)
-                perm["description"] = (
-                    f"{value.get('description', '')}\n"
-                    "PARALLEL NOTE: For each parallel_continuation_ids[i], permission is still locked to that session. "
-                    "If you need to change permission for a resumed task, start a new session for that task "
-                    "(use empty string in parallel_continuation_ids[i])."
-                ).strip()
-                properties[key] = perm
-            else:
-                properties[key] = value
-        # parallel 模式下 model 改为数组类型
-        properties["model"] = {
-            "type": "array",
-            "items": {"type": "string"},
-            "default": [],
-            "description": (
-                "Model override(s). If single element, all tasks use that model. "
-                "If multiple elements, must match parallel_prompts length - each task uses corresponding model. "
-                "Empty array uses CLI default."
-            ),
+        # parallel 模式下末尾参数排除 task_note
+        properties = {
+            **_PARALLEL_COMMON_PROPERTIES,
+            **specific,
+            **PARALLEL_PROPERTIES,
+            "debug": TAIL_PROPERTIES["debug"],
         }
+        required = list(_REQUIRED_CLI_PARALLEL)
     else:
-        properties.update(COMMON_PROPERTIES)
-
-    # 2. 特有参数
-    if cli_type == "codex":
-        properties.update(CODEX_PROPERTIES)
-    elif cli_type == "claude":
-        properties.update(CLAUDE_PROPERTIES)
-    elif cli_type == "opencode":
-        properties.update(OPENCODE_PROPERTIES)
-
-    # 3. Parallel 参数（仅 parallel 模式）
-    if is_parallel:
-        properties.update(PARALLEL_PROPERTIES)
-
-    # 4. 末尾参数（parallel 模式下排除 task_note）
-    if is_parallel:
-        properties["debug"] = TAIL_PROPERTIES["debug"]
-    else:
-        properties.update(TAIL_PROPERTIES)
-
-    # 构建 required 字段
-    if is_parallel:
-        required = ["workspace", "handoff_file", "parallel_prompts", "parallel_task_notes"]
-    else:
-        required = ["prompt", "workspace", "handoff_file"]
+        properties = {**COMMON_PROPERTIES, **specific, **TAIL_PROPERTIES}
+        required = list(_REQUIRED_CLI)
 
     return {
         "type": "object",
         "properties": properties,
         "required": required,
     }
+
+
+# (cli_type, is_parallel) -> 完整 schema：已知组合在导入时全部构建，调用时一次查表。
+# Banana / Image 不支持 parallel，两种变体都指向同一个固定 schema
+_SCHEMA_TABLE: dict[tuple[str, bool], dict[str, Any]] = {
+    **{
+        (cli_type, is_parallel): _build_cli_schema(cli_type, is_parallel)
+        for cli_type in PARALLEL_SUPPORTED_TOOLS
+        for is_parallel in (False, True)
+    },
+    **{
+        (cli_type, is_parallel): schema
+        for cli_type, schema in (("banana", _BANANA_SCHEMA), ("image", _IMAGE_SCHEMA))
+        for is_parallel in (False, True)
+    },
+}
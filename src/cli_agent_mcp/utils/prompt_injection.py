@@ -7,18 +7,8 @@ from __future__ import annotations
 
 __all__ = ["inject_context_and_report_mode"]
 
-
-def inject_context_and_report_mode(
-    prompt: str,
-    context_paths: list[str],
-    report_mode: bool,
-) -> str:
-    """将 context_paths 和 report_mode 注入到 prompt 中。"""
-    result = prompt
-
-    # 处理 report_mode
-    if report_mode:
-        injection_note = """
+# report_mode 注入文本（静态，模块加载时构建一次）
+_REPORT_MODE_NOTE = """
 
 <mcp-injection type="report-mode">
   <meta-rules>
@@ -50,12 +40,9 @@ def inject_context_and_report_mode(
     <guideline>Include small, relevant code snippets inline when they help the reader understand without opening the file.</guideline>
   </code-guidelines>
 </mcp-injection>"""
-        result += injection_note
 
-    # 处理 context_paths
-    if context_paths:
-        paths_xml = "\n".join(f"    <path>{p}</path>" for p in context_paths)
-        context_note = f"""
+# context_paths 注入块的固定首尾与单条路径模板
+_CONTEXT_HEAD = """
 
 <mcp-injection type="reference-paths">
   <description>
@@ -63,9 +50,33 @@ def inject_context_and_report_mode(
     You may use them to understand naming conventions and file organization.
   </description>
   <paths>
-{paths_xml}
+"""
+_CONTEXT_TAIL = """
   </paths>
 </mcp-injection>"""
-        result += context_note
+_PATH_TMPL = "    <path>{}</path>"
+
 
-    return result
+def _context_block(context_paths: list[str]) -> str:
+    """构建 reference-paths 注入块。"""
+    paths_xml = "\n".join(_PATH_TMPL.format(p) for p in context_paths)
+    return _CONTEXT_HEAD + paths_xml + _CONTEXT_TAIL
+
+
+def inject_context_and_report_mode(
+    prompt: str,
+    context_paths: list[str],
+    report_mode: bool,
+) -> str:
+    """将 context_paths 和 report_mode 注入到 prompt 中。"""
+    if not report_mode and not context_paths:
+        return prompt
+
+    parts = [prompt]
+    # 处理 report_mode
+    if report_mode:
+        parts.append(_REPORT_MODE_NOTE)
+    # 处理 context_paths
+    if context_paths:
+        parts.append(_context_block(context_paths))
+    return "".join(parts)
@@ -9,6 +9,7 @@
 
 from __future__ import annotations
 
+import dataclasses
 import tempfile
 from pathlib import Path
 
@@ -21,15 +22,24 @@ from cli_agent_mcp.shared.invokers import (
     CodexInvoker,
     CodexParams,
     CommonParams,
+    DebugInfo,
+    ExecutionContext,
     ExecutionResult,
     GeminiInvoker,
     GeminiParams,
     GUIMetadata,
+    OpencodeInvoker,
     Permission,
     PERMISSION_MAP_CLAUDE,
     PERMISSION_MAP_CODEX,
     create_invoker,
 )
+from cli_agent_mcp.shared.parsers import (
+    ContentType,
+    MessageEvent,
+    OperationEvent,
+    OperationType,
+)
 
 
 # =============================================================================
@@ -142,6 +152,15 @@ class TestCommonParams:
         )
         assert params.permission == Permission.WORKSPACE_WRITE
 
+    def test_invalid_permission_string(self, temp_workspace: Path):
+        """测试非法 permission 字符串抛出 ValueError。"""
+        with pytest.raises(ValueError):
+            CommonParams(
+                prompt="test",
+                workspace=temp_workspace,
+                permission="root",  # type: ignore
+            )
+
 
 class TestCodexParams:
     """CodexParams 测试。"""
@@ -233,6 +252,27 @@ class TestExecutionResult:
         assert "error" not in d  # 成功时不包含 error
         assert d["gui_metadata"]["source"] == "codex"
 
+    def test_to_dict_fresh_and_frozen(self):
+        """测试 to_dict 每次返回新字典（反映 debug_info 的更新）且实例不可变。"""
+        debug_info = DebugInfo(message_count=1)
+        result = ExecutionResult(success=True, session_id="s1", debug_info=debug_info)
+        first = result.to_dict()
+        first["session_id"] = "mutated"
+        debug_info.message_count = 2
+        second = result.to_dict()
+        assert second["session_id"] == "s1"
+        assert second["debug_info"]["message_count"] == 2
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.success = False  # type: ignore[misc]
+
+        replaced = dataclasses.replace(result, session_id="s2")
+        assert replaced.to_dict()["session_id"] == "s2"
+        assert result.to_dict()["session_id"] == "s1"
+
+    def test_debug_info_duration_rounded(self):
+        """测试 DebugInfo.to_dict 的 duration_sec 保留 3 位小数。"""
+        assert DebugInfo(duration_sec=1.2345678901).to_dict()["duration_sec"] == 1.235
+
 
 # =============================================================================
 # 命令构建测试
@@ -258,6 +298,20 @@ class TestCodexInvokerCommand:
         assert "--json" in cmd
         # prompt 通过 stdin 传递，不在 cmd 中
 
+    def test_reassigned_paths_reflected(self, temp_workspace: Path):
+        """测试重新赋值 workspace / image 后命令使用新路径。"""
+        invoker = CodexInvoker()
+        params = CodexParams(prompt="hello", workspace=temp_workspace)
+        invoker.build_command(params)
+
+        other = temp_workspace / "sub"
+        params.workspace = other
+        params.image = [other / "a.png"]
+        cmd = invoker.build_command(params)
+
+        assert cmd[cmd.index("--cd") + 1] == str(other.absolute())
+        assert cmd[cmd.index("--image") + 1] == str((other / "a.png").absolute())
+
     def test_permission_mapping(self, temp_workspace: Path):
         """测试权限映射。"""
         invoker = CodexInvoker()
@@ -481,7 +535,7 @@ class TestParamValidation:
         with pytest.raises(ValueError, match="not a directory"):
             invoker.validate_params(params)
 
-    def test_nonexistent_image(self, temp_workspace: Path):
+    async def test_nonexistent_image(self, temp_workspace: Path):
         """测试不存在的图片验证。"""
         invoker = CodexInvoker()
         params = CodexParams(
@@ -489,8 +543,9 @@ class TestParamValidation:
             workspace=temp_workspace,
             image=[Path("/nonexistent/image.png")],
         )
+        invoker.validate_params(params)
         with pytest.raises(ValueError, match="Image file does not exist"):
-            invoker.validate_params(params)
+            await invoker._validate_files(params)
 
     def test_both_system_prompts(self, temp_workspace: Path):
         """测试同时指定两种系统提示词。"""
@@ -549,6 +604,17 @@ class TestCreateInvoker:
         invoker = create_invoker(CLIType.CODEX, event_callback=callback)
         assert invoker._event_callback is callback
 
+    def test_error_event_keeps_session_id_key(self):
+        """错误/取消事件始终包含 session_id 键（即使尚无会话），启动事件不包含。"""
+        events = []
+        invoker = create_invoker(CLIType.CODEX, event_callback=events.append)
+
+        invoker._send_error_event("boom")
+        invoker._send_process_started_event()
+
+        assert events[0].raw["session_id"] == ""
+        assert "session_id" not in events[1].raw
+
     def test_invalid_type(self):
         """测试无效类型。"""
         with pytest.raises(ValueError):
@@ -579,3 +645,102 @@ class TestCLIProperties:
 
         invoker = ClaudeInvoker(claude_path="/custom/claude")
         assert invoker._claude_path == "/custom/claude"
+
+
+# =============================================================================
+# 事件解析测试
+# =============================================================================
+
+
+class TestLoadsStdoutLine:
+    """_loads_stdout_line 测试。"""
+
+    def test_invalid_utf8_inside_json_string(self):
+        """JSON 字符串中含非法 UTF-8 字节时仍解析为事件。"""
+        from cli_agent_mcp.shared.invokers.base import _loads_stdout_line
+
+        raw = b'{"type": "agent_message", "text": "bad \xff byte"}'
+        data = _loads_stdout_line(raw)
+
+        assert data["type"] == "agent_message"
+        assert data["text"] == "bad \ufffd byte"
+
+    def test_non_json_raises_value_error(self):
+        """非 JSON 行仍抛出 ValueError。"""
+        from cli_agent_mcp.shared.invokers.base import _loads_stdout_line
+
+        with pytest.raises(ValueError):
+            _loads_stdout_line(b"Error: rate limited \xff")
+
+
+class TestOpencodeErrorLine:
+    """OpenCode _extract_error_from_line 测试。"""
+
+    def test_main_error_line(self):
+        """主错误行返回 (错误名, 消息)，消息不含行尾换行。"""
+        invoker = OpencodeInvoker()
+
+        assert invoker._extract_error_from_line("XError: a\n") == ("XError", "a")
+        assert invoker._extract_error_from_line("ProviderModelNotFoundError: no model  ") == (
+            "ProviderModelNotFoundError",
+            "no model",
+        )
+        assert invoker._extract_error_from_line("XError:\n") == ("XError", "XError")
+        assert invoker._extract_error_from_line("at foo (Error: x)") is None
+
+
+class TestExecutionContext:
+    """ExecutionContext 测试。"""
+
+    def test_final_answer_parts_joined(self):
+        """测试 delta 分片在读取 final_answer 时拼接。"""
+        ctx = ExecutionContext()
+        assert ctx.final_answer == ""
+
+        ctx.final_answer_parts.extend(["Hel", "lo"])
+        assert ctx.final_answer == "Hello"
+        assert ctx.final_answer_parts == ["Hello"]
+
+        ctx.final_answer = ""
+        assert ctx.final_answer_parts == []
+
+
+class TestProcessEvent:
+    """_process_event 测试。"""
+
+    def test_collects_answer_and_stats(self, temp_workspace: Path):
+        """测试答案累积、reasoning 过滤与工具调用计数。"""
+        invoker = CodexInvoker()
+        invoker._ctx = ExecutionContext()
+        params = CodexParams(prompt="test", workspace=temp_workspace)
+
+        events = [
+            MessageEvent(session_id="s1", text="thinking", content_type=ContentType.REASONING),
+            MessageEvent(text="first"),
+            OperationEvent(operation_type=OperationType.COMMAND, raw={"model": "m1"}),
+            OperationEvent(operation_type=OperationType.FILE),
+            MessageEvent(text="fi"),
+            MessageEvent(text="n", is_delta=True),
+            MessageEvent(text="al", is_delta=True),
+        ]
+        for event in events:
+            invoker._process_event(event, params)
+
+        assert invoker._session_id == "s1"
+        assert invoker._final_answer == "final"
+        assert invoker._agent_messages == ["first"]
+        assert invoker._debug_info.tool_call_count == 1
+        assert invoker._debug_info.model == "m1"
+        assert invoker._debug_info.message_count == 7
+
+    def test_raw_messages_collected_only_when_enabled(self, temp_workspace: Path):
+        """测试仅在 collect_all_messages=True 时保留原始事件。"""
+        params = CodexParams(prompt="test", workspace=temp_workspace)
+        event = MessageEvent(text="hi", raw={"type": "message"})
+
+        for enabled, expected in ((False, []), (True, [{"type": "message"}])):
+            invoker = CodexInvoker(collect_all_messages=enabled)
+            invoker._ctx = ExecutionContext()
+            invoker._process_event(event, params)
+            assert invoker._collected_messages == expected
+            assert invoker._debug_info.message_count == 1
@@ -22,6 +22,7 @@ from cli_agent_mcp.shared.parsers import (
     SystemEvent,
     create_parser,
     detect_source,
+    make_event_id,
     parse_event,
     parse_events,
 )
@@ -526,6 +527,27 @@ class TestForwardCompatibility:
         assert event.session_id == "123"
 
 
+class TestEventToDict:
+    """测试事件转字典。"""
+
+    def test_to_dict_includes_category(self):
+        """to_dict 包含全部字段及类级 category。"""
+        event = MessageEvent(source=CLISource.CODEX, text="hi", raw={"type": "x"})
+        d = event.to_dict()
+
+        assert d["category"] == EventCategory.MESSAGE
+        assert d["source"] == CLISource.CODEX
+        assert d["text"] == "hi"
+        assert d["raw"] == {"type": "x"}
+        assert d["event_id"] == event.event_id
+
+    def test_make_event_id_unique(self):
+        """同一进程内生成的事件 ID 不重复。"""
+        ids = {make_event_id("codex", "text") for _ in range(1000)}
+        assert len(ids) == 1000
+        assert all(i.startswith("codex_text_") for i in ids)
+
+
 class TestClaudeParser:
     """测试 Claude 解析器。"""
 
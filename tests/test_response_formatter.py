@@ -0,0 +1,73 @@
+"""ResponseFormatter 测试。
+
+验证 XML 转义行为：
+- 普通答案只转义 & < >，引号保持原样
+- parallel 的 <agent-output> 包装不会被二次转义
+"""
+
+from __future__ import annotations
+
+from cli_agent_mcp.shared.response_formatter import DebugInfo, ResponseData, ResponseFormatter
+from cli_agent_mcp.utils.xml_wrapper import build_wrapper
+
+
+def _wrapped(status: str) -> str:
+    """按 ParallelHandler 的方式构建 wrapper 输出。"""
+    return "\n".join(
+        build_wrapper(
+            agent="codex",
+            continuation_id=f"sess-{i}",
+            task_note=f"task {i}",
+            task_index=i,
+            status=status,
+            prompt="Review a < b",
+            response="It's \"fine\"",
+        )
+        for i in (1, 2)
+    )
+
+
+class TestAnswerEscaping:
+    """答案转义测试。"""
+
+    def test_plain_answer_escapes_text_only(self):
+        """普通答案转义 & < >，保留引号。"""
+        output = ResponseFormatter().format(ResponseData(answer='a < b && it\'s "ok"'))
+
+        assert 'a &lt; b &amp;&amp; it\'s "ok"' in output
+        assert "&quot;" not in output
+        assert "&apos;" not in output
+
+    def test_parallel_output_not_reescaped(self):
+        """parallel 的 agent-output XML 原样输出。"""
+        wrapped = _wrapped("success")
+        output = ResponseFormatter().format(
+            ResponseData(answer=wrapped, answer_is_xml=True)
+        )
+
+        assert wrapped in output
+        assert '<agent-output agent="codex" continuation_id="sess-1"' in output
+        assert "&lt;agent-output" not in output
+
+    def test_parallel_failure_partial_answer_not_reescaped(self):
+        """parallel 部分失败时 partial_answer 同样原样输出。"""
+        wrapped = _wrapped("error")
+        output = ResponseFormatter().format(
+            ResponseData(
+                answer=wrapped,
+                success=False,
+                error="1 of 2 tasks failed",
+                answer_is_xml=True,
+            )
+        )
+
+        assert f"<partial_answer>{wrapped}</partial_answer>" in output
+        assert "&lt;agent-output" not in output
+
+
+class TestDebugInfo:
+    """DebugInfo 序列化测试。"""
+
+    def test_duration_rounded_in_dict(self):
+        """to_dict 中的 duration_sec 保留 3 位小数。"""
+        assert DebugInfo(duration_sec=1.2345678901).to_dict()["duration_sec"] == 1.235
@@ -150,6 +150,72 @@ class TestToolSchemaLogic:
         assert "system_prompt" in fields
         assert "append_system_prompt" in fields
 
+    def test_normalize_tool_name(self):
+        """工具名拆分为 (base_name, is_parallel)，包括表外名称。"""
+        from cli_agent_mcp.tool_schema import normalize_tool_name
+
+        assert normalize_tool_name("codex") == ("codex", False)
+        assert normalize_tool_name("claude_parallel") == ("claude", True)
+        assert normalize_tool_name("custom_parallel") == ("custom", True)
+        assert normalize_tool_name("_parallel") == ("", True)
+        assert normalize_tool_name("parallel") == ("parallel", False)
+        assert normalize_tool_name("") == ("", False)
+
+    def test_tool_schema_cached(self):
+        """相同参数返回同一个预构建的 schema。"""
+        from cli_agent_mcp.tool_schema import create_tool_schema
+
+        schema = create_tool_schema("codex")
+        assert create_tool_schema("codex", is_parallel=False) is schema
+        assert create_tool_schema("codex", is_parallel=True) is not schema
+        assert schema["required"] == ["prompt", "workspace", "handoff_file"]
+
+    def test_tool_schema_fallback(self):
+        """未知工具按通用规则即时构建；banana 的 parallel 变体使用固定 schema。"""
+        from cli_agent_mcp.tool_schema import create_tool_schema
+
+        unknown = create_tool_schema("unknown-cli")
+        assert unknown == create_tool_schema("unknown-cli", False)
+        assert unknown["required"] == ["prompt", "workspace", "handoff_file"]
+
+        banana = create_tool_schema("banana")
+        assert create_tool_schema("banana", is_parallel=True) is banana
+
+    async def test_list_tools_keeps_shared_schemas_intact(self):
+        """注册与列出工具不会修改预构建的共享 schema。"""
+        import copy
+
+        from fastmcp import Client
+
+        from cli_agent_mcp import tool_schema
+        from cli_agent_mcp.server import create_server
+
+        before = copy.deepcopy(tool_schema._SCHEMA_TABLE)
+        mcp = create_server()
+        async with Client(mcp) as client:
+            tools = await client.list_tools()
+
+        assert tools
+        assert tool_schema._SCHEMA_TABLE == before
+
+    def test_tool_schema_shares_property_dicts(self):
+        """schema 直接引用公共参数的子 schema，且可被 JSON 序列化。"""
+        import json
+
+        from cli_agent_mcp.tool_schema import (
+            COMMON_PROPERTIES,
+            PARALLEL_SUPPORTED_TOOLS,
+            create_tool_schema,
+        )
+
+        schema = create_tool_schema("gemini")
+        assert schema["properties"]["workspace"] is COMMON_PROPERTIES["workspace"]
+
+        for tool in SUPPORTED_TOOLS:
+            json.dumps(create_tool_schema(tool))
+        for tool in PARALLEL_SUPPORTED_TOOLS:
+            json.dumps(create_tool_schema(tool, is_parallel=True))
+
 
 class TestDebugMode:
     """测试 Debug 模式。"""
@@ -188,3 +254,24 @@ class TestGUIConfig:
         with mock.patch.dict(os.environ, {"CAM_GUI_DETAIL": "true"}, clear=False):
             config = reload_config()
             assert config.gui_detail is True
+
+
+class TestLogFormatter:
+    """测试 LOG_DEBUG 模式的日志格式化器。"""
+
+    def test_unified_event_serialized_as_json(self):
+        """统一事件（slots dataclass）经 to_dict() 序列化为 JSON。"""
+        import json
+        import logging
+
+        from cli_agent_mcp.app import _JsonSerializingFormatter
+        from cli_agent_mcp.shared.parsers import CLISource, make_fallback_event
+
+        event = make_fallback_event(CLISource.CODEX, {"type": "custom", "text": "hi"})
+        record = logging.LogRecord("test", logging.DEBUG, __file__, 1, "event: %s", (event,), None)
+
+        output = _JsonSerializingFormatter("%(message)s").format(record)
+
+        data = json.loads(output.removeprefix("event: "))
+        assert data == json.loads(json.dumps(event.to_dict(), default=str))
+        assert data["raw"] == {"type": "custom", "text": "hi"}
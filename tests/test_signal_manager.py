@@ -17,7 +17,23 @@ import pytest
 
 from cli_agent_mcp.config import SigintMode
 from cli_agent_mcp.orchestrator import RequestRegistry
-from cli_agent_mcp.signal_manager import SignalManager
+from cli_agent_mcp.signal_manager import SignalManager, _call_now
+
+
+@pytest.fixture
+def manager_loop():
+    """未运行的事件循环，用于创建关闭 Future。"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def _bind_loop(manager: SignalManager, loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+    """按 start() 的方式绑定事件循环与关闭 Future（不安装真实信号处理器）。"""
+    manager._loop = loop
+    manager._shutdown_event = loop.create_future()
+    manager._wake = _call_now
+    return manager._shutdown_event
 
 
 class TestSigintMode:
@@ -100,7 +116,26 @@ class TestSignalManagerSigintCancel:
         # 验证没有请求关闭
         assert manager.is_shutdown_requested is False
 
-    def test_sigint_without_active_requests_shuts_down(self):
+    def test_rapid_sigint_coalesced(self):
+        """合并窗口内的重复 SIGINT 只取消一次。"""
+        registry = RequestRegistry()
+        task = mock.MagicMock(spec=asyncio.Task)
+        task.done.return_value = False
+        registry.register("req-1", "codex", task)
+
+        manager = SignalManager(
+            registry,
+            sigint_mode=SigintMode.CANCEL,
+        )
+
+        with mock.patch("time.monotonic_ns", side_effect=[10**12, 10**12 + 1_000]):
+            manager._handle_sigint()
+            manager._handle_sigint()
+
+        task.cancel.assert_called_once()
+        assert manager.is_shutdown_requested is False
+
+    def test_sigint_without_active_requests_shuts_down(self, manager_loop):
         """没有活动请求时 SIGINT 请求关闭。"""
         registry = RequestRegistry()
 
@@ -108,20 +143,20 @@ class TestSignalManagerSigintCancel:
             registry,
             sigint_mode=SigintMode.CANCEL,
         )
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 模拟 SIGINT
         manager._handle_sigint()
 
         # 验证请求关闭
         assert manager.is_shutdown_requested is True
+        assert future.done()
 
 
 class TestSignalManagerSigintExit:
     """SignalManager SIGINT EXIT 模式测试。"""
 
-    def test_sigint_always_shuts_down(self):
+    def test_sigint_always_shuts_down(self, manager_loop):
         """EXIT 模式下 SIGINT 始终请求关闭。"""
         registry = RequestRegistry()
         task = mock.MagicMock(spec=asyncio.Task)
@@ -132,14 +167,14 @@ class TestSignalManagerSigintExit:
             registry,
             sigint_mode=SigintMode.EXIT,
         )
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 模拟 SIGINT
         manager._handle_sigint()
 
         # 验证请求关闭（即使有活动请求）
         assert manager.is_shutdown_requested is True
+        assert future.done()
 
         # 验证请求没有被取消
         task.cancel.assert_not_called()
@@ -148,7 +183,7 @@ class TestSignalManagerSigintExit:
 class TestSignalManagerSigintCancelThenExit:
     """SignalManager SIGINT CANCEL_THEN_EXIT 模式测试。"""
 
-    def test_sigint_first_cancels_second_exits(self):
+    def test_sigint_first_cancels_second_exits(self, manager_loop):
         """CANCEL_THEN_EXIT 模式：第一次取消，第二次退出。"""
         registry = RequestRegistry()
         task = mock.MagicMock(spec=asyncio.Task)
@@ -160,8 +195,7 @@ class TestSignalManagerSigintCancelThenExit:
             sigint_mode=SigintMode.CANCEL_THEN_EXIT,
             double_tap_window=1.0,
         )
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 第一次 SIGINT
         manager._handle_sigint()
@@ -170,9 +204,10 @@ class TestSignalManagerSigintCancelThenExit:
         task.cancel.assert_called_once()
 
         # 验证标记为已请求关闭但没有触发实际关闭
-        assert manager._shutdown_requested is True
+        assert manager.is_shutdown_requested is True
+        assert not future.done()
 
-    def test_sigint_without_active_requests_shuts_down(self):
+    def test_sigint_without_active_requests_shuts_down(self, manager_loop):
         """CANCEL_THEN_EXIT 模式：没有活动请求时直接关闭。"""
         registry = RequestRegistry()
 
@@ -180,20 +215,20 @@ class TestSignalManagerSigintCancelThenExit:
             registry,
             sigint_mode=SigintMode.CANCEL_THEN_EXIT,
         )
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 模拟 SIGINT
         manager._handle_sigint()
 
         # 验证请求关闭
         assert manager.is_shutdown_requested is True
+        assert future.done()
 
 
 class TestSignalManagerDoubleTap:
     """SignalManager 双击退出测试。"""
 
-    def test_double_tap_forces_exit(self):
+    def test_double_tap_forces_exit(self, manager_loop):
         """双击 SIGINT 设置强制退出标志。
 
         注意：新实现不再直接调用 sys.exit(130)，而是设置 is_force_exit 标志，
@@ -206,28 +241,58 @@ class TestSignalManagerDoubleTap:
             sigint_mode=SigintMode.CANCEL_THEN_EXIT,
             double_tap_window=1.0,
         )
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 设置状态：已请求关闭
-        manager._shutdown_requested = True
+        manager._sig_state |= SignalManager._ST_REQ
 
-        # 第一次 SIGINT
-        manager._handle_sigint()
+        with mock.patch.object(manager, "_arm_force_exit_backstop") as arm:
+            # 第一次 SIGINT
+            manager._handle_sigint()
 
-        # 第二次 SIGINT（在窗口内）- 应该设置强制退出标志
-        manager._handle_sigint()
+            # 第二次 SIGINT（在窗口内）- 应该设置强制退出标志
+            manager._handle_sigint()
+
+        arm.assert_called_once()
 
         # 验证强制退出标志被设置
         assert manager.is_force_exit is True
         # 验证 shutdown event 被触发
-        manager._loop.call_soon_threadsafe.assert_called()
+        assert future.done()
+
+    def test_force_exit_backstop_timer(self):
+        """强制退出兜底定时器是守护线程，不依赖事件循环。"""
+        registry = RequestRegistry()
+        manager = SignalManager(registry, force_exit_timeout=3.0)
+
+        with mock.patch("cli_agent_mcp.signal_manager.threading.Timer") as timer_cls:
+            manager._arm_force_exit_backstop()
+
+        timer_cls.assert_called_once_with(3.0, manager._force_exit_now)
+        timer = timer_cls.return_value
+        assert timer.daemon is True
+        timer.start.assert_called_once()
+
+        # 清理完成后取消定时器，重复取消无副作用
+        manager.cancel_force_exit_backstop()
+        manager.cancel_force_exit_backstop()
+        timer.cancel.assert_called_once()
+
+    def test_force_exit_now_exits_130(self):
+        """兜底定时器到期时记录日志并 os._exit(130)。"""
+        registry = RequestRegistry()
+        manager = SignalManager(registry)
+
+        with mock.patch("cli_agent_mcp.signal_manager.os._exit") as exit_mock:
+            manager._force_exit_now()
+
+        exit_mock.assert_called_once_with(130)
 
 
 class TestSignalManagerSigterm:
     """SignalManager SIGTERM 测试。"""
 
-    def test_sigterm_cancels_all_and_shuts_down(self):
+    def test_sigterm_cancels_all_and_shuts_down(self, manager_loop):
         """SIGTERM 取消所有请求并关闭。"""
         registry = RequestRegistry()
         task = mock.MagicMock(spec=asyncio.Task)
@@ -235,8 +300,7 @@ class TestSignalManagerSigterm:
         registry.register("req-1", "codex", task)
 
         manager = SignalManager(registry)
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 模拟 SIGTERM
         manager._handle_sigterm()
@@ -246,12 +310,13 @@ class TestSignalManagerSigterm:
 
         # 验证请求关闭
         assert manager.is_shutdown_requested is True
+        assert future.done()
 
 
 class TestSignalManagerCallbacks:
     """SignalManager 回调测试。"""
 
-    def test_on_shutdown_callback(self):
+    def test_on_shutdown_callback(self, manager_loop):
         """关闭时调用回调。"""
         registry = RequestRegistry()
         callback = mock.MagicMock()
@@ -261,20 +326,38 @@ class TestSignalManagerCallbacks:
             sigint_mode=SigintMode.EXIT,
             on_shutdown=callback,
         )
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 模拟 SIGINT（EXIT 模式直接关闭）
         manager._handle_sigint()
 
         # 验证回调被调用
         callback.assert_called_once()
+        assert future.done()
+
+    def test_callback_called_once_on_repeated_force(self, manager_loop):
+        """多次强制退出只调用一次回调。"""
+        registry = RequestRegistry()
+        callback = mock.MagicMock()
+
+        manager = SignalManager(registry, on_shutdown=callback)
+        future = _bind_loop(manager, manager_loop)
+
+        with mock.patch.object(manager, "_arm_force_exit_backstop") as arm:
+            manager._force_shutdown()
+            manager._force_shutdown()
+            manager._request_shutdown()
+
+        callback.assert_called_once()
+        arm.assert_called_once()
+        assert manager.is_force_exit is True
+        assert future.done()
 
 
 class TestSignalManagerGracefulShutdown:
     """SignalManager 程序化关闭测试。"""
 
-    def test_request_graceful_shutdown(self):
+    def test_request_graceful_shutdown(self, manager_loop):
         """程序化请求优雅退出。"""
         registry = RequestRegistry()
         task = mock.MagicMock(spec=asyncio.Task)
@@ -282,8 +365,7 @@ class TestSignalManagerGracefulShutdown:
         registry.register("req-1", "codex", task)
 
         manager = SignalManager(registry)
-        manager._shutdown_event = asyncio.Event()
-        manager._loop = mock.MagicMock()
+        future = _bind_loop(manager, manager_loop)
 
         # 程序化请求关闭
         manager.request_graceful_shutdown()
@@ -291,8 +373,11 @@ class TestSignalManagerGracefulShutdown:
         # 验证请求被取消
         task.cancel.assert_called_once()
 
-        # 验证请求关闭
+        # 验证请求关闭：Future 经 call_soon_threadsafe 在循环下一轮完成
         assert manager.is_shutdown_requested is True
+        assert not future.done()
+        manager_loop.run_until_complete(asyncio.sleep(0))
+        assert future.done()
 
 
 @pytest.mark.skipif(sys.platform == "win32", reason="POSIX signal handling")
@@ -314,6 +399,52 @@ class TestSignalManagerStartStop:
         await manager.stop()
         assert manager._running is False
 
+    @pytest.mark.asyncio
+    async def test_wait_for_shutdown_after_request(self):
+        """程序化关闭后 wait_for_shutdown 返回，重复请求无副作用。"""
+        registry = RequestRegistry()
+        manager = SignalManager(registry)
+
+        await manager.start()
+        try:
+            manager.request_graceful_shutdown()
+            manager.request_graceful_shutdown()
+            await asyncio.wait_for(manager.wait_for_shutdown(), timeout=1.0)
+        finally:
+            await manager.stop()
+
+        assert manager.is_shutdown_requested is True
+
+    @pytest.mark.asyncio
+    async def test_shutdown_requested_before_start(self):
+        """start() 之前的关闭请求不会丢失。"""
+        registry = RequestRegistry()
+        manager = SignalManager(registry)
+
+        manager.request_graceful_shutdown()
+        await manager.start()
+        try:
+            await asyncio.wait_for(manager.wait_for_shutdown(), timeout=1.0)
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_graceful_shutdown_from_other_thread(self):
+        """其他线程中的程序化关闭请求能唤醒事件循环。"""
+        import threading
+
+        registry = RequestRegistry()
+        manager = SignalManager(registry)
+
+        await manager.start()
+        try:
+            thread = threading.Thread(target=manager.request_graceful_shutdown)
+            thread.start()
+            await asyncio.wait_for(manager.wait_for_shutdown(), timeout=1.0)
+            thread.join()
+        finally:
+            await manager.stop()
+
 
 class TestConfigParsing:
     """配置解析测试。"""
@@ -359,3 +490,16 @@ class TestConfigParsing:
         with mock.patch.dict(os.environ, {"CAM_SIGINT_DOUBLE_TAP_WINDOW": "invalid"}):
             config = load_config()
             assert config.sigint_double_tap_window == 1.0
+
+    def test_parse_force_exit_timeout(self):
+        """强制退出兜底时间：默认值、范围限制与无效值。"""
+        from cli_agent_mcp.config import load_config
+
+        with mock.patch.dict(os.environ, {"CAM_SIGINT_FORCE_EXIT_TIMEOUT": "2.5"}):
+            assert load_config().sigint_force_exit_timeout == 2.5
+
+        with mock.patch.dict(os.environ, {"CAM_SIGINT_FORCE_EXIT_TIMEOUT": "0.1"}):
+            assert load_config().sigint_force_exit_timeout == 1.0
+
+        with mock.patch.dict(os.environ, {"CAM_SIGINT_FORCE_EXIT_TIMEOUT": "invalid"}):
+            assert load_config().sigint_force_exit_timeout == 5.0